@@ -4,26 +4,115 @@ Uses Word2Vec for local, efficient text embeddings without API calls
 """
 
 import os
+import io
 import json
 import re
-from datetime import datetime
-from typing import List, Dict, Any
-from fastapi import FastAPI, File, UploadFile, Form, HTTPException
+import codecs
+import hashlib
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Dict, Any, BinaryIO, Optional, Tuple
+from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Request, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 import PyPDF2
 from docx import Document
 import numpy as np
-from gensim.models import Word2Vec
+from gensim.models import KeyedVectors, Word2Vec
 from apscheduler.schedulers.background import BackgroundScheduler
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+from src.admission import AdmissionController, AdmissionMiddleware, Overloaded, overloaded_handler, render_metrics
+from src.catalog_snapshot import CatalogSnapshot
+from src.field_embeddings import FieldMatrix, build_field_matrix, parse_weights
+from src.response_cache import ResponseCache
+from src.structured_logging import log_event, setup_logging
+from src.tokenizer import normalize, tokenizer_for, words
+
+# Configure logging: structured records, written by a background thread (see src/structured_logging.py)
+setup_logging()
 logger = logging.getLogger(__name__)
 
+# Upload limits: bodies above MAX_UPLOAD_BYTES are rejected with 413 while streaming.
+# Starlette spools each uploaded file to a temporary file past 1 MB, so memory per
+# request stays bounded whatever the file size.
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+UPLOAD_PATHS = ("/recommend", "/recommend/stream")
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class UploadSizeLimitMiddleware:
+    """Reject oversized upload bodies early instead of buffering them first"""
+
+    def __init__(self, app, max_bytes: int, paths=UPLOAD_PATHS):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.paths = paths
+
+    def _too_large(self) -> str:
+        return f"Upload exceeds the {self.max_bytes} byte limit"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        # Declared size: answer before reading a single body byte
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_bytes:
+            response = JSONResponse({"detail": self._too_large()}, status_code=413)
+            await response(scope, receive, send)
+            return
+
+        # Chunked or understated bodies: count bytes as the form parser pulls them
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    raise HTTPException(status_code=413, detail=self._too_large())
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+# Admission control for the expensive upload path, in two stages. UPLOAD_MAX_TRANSFERS
+# caps upload requests in progress and is checked before the body is read, so shed
+# load never costs a body transfer. A processing slot (UPLOAD_MAX_CONCURRENCY, with a
+# wait queue) is only taken once the upload is spooled, so slow clients still sending
+# their resume do not hold slots meant for parsing and scoring. Keep
+# UPLOAD_MAX_TRANSFERS above UPLOAD_MAX_CONCURRENCY + UPLOAD_MAX_QUEUE.
+UPLOAD_MAX_TRANSFERS = int(os.getenv("UPLOAD_MAX_TRANSFERS", "32"))
+UPLOAD_MAX_CONCURRENCY = int(os.getenv("UPLOAD_MAX_CONCURRENCY", "4"))
+UPLOAD_MAX_QUEUE = int(os.getenv("UPLOAD_MAX_QUEUE", "16"))
+UPLOAD_QUEUE_TIMEOUT_MS = float(os.getenv("UPLOAD_QUEUE_TIMEOUT_MS", "5000"))
+
+upload_transfers = AdmissionController(
+    "upload_transfer",
+    max_concurrent=UPLOAD_MAX_TRANSFERS,
+    max_queue=0,
+    queue_timeout=0
+)
+upload_admission = AdmissionController(
+    "upload_recommend",
+    max_concurrent=UPLOAD_MAX_CONCURRENCY,
+    max_queue=UPLOAD_MAX_QUEUE,
+    queue_timeout=UPLOAD_QUEUE_TIMEOUT_MS / 1000.0
+)
+
 # Initialize FastAPI app
 app = FastAPI(title="Internship Recommender", version="1.0")
 
+# Added before CORS so 413/429/503 responses still carry CORS headers
+app.add_middleware(UploadSizeLimitMiddleware, max_bytes=MAX_UPLOAD_BYTES)
+app.add_middleware(AdmissionMiddleware, controller=upload_transfers, paths=UPLOAD_PATHS)
+app.add_exception_handler(Overloaded, overloaded_handler)
+
 # CORS configuration
 app.add_middleware(
     CORSMiddleware,
@@ -36,6 +125,10 @@ app.add_middleware(
 # Scheduler for background tasks
 scheduler = BackgroundScheduler()
 
+# Serialized responses, invalidated whenever CATALOG_VERSION changes
+response_cache = ResponseCache(ttl_seconds=float(os.getenv("RESPONSE_CACHE_TTL", "300")))
+INTERNSHIPS_CACHE_CONTROL = "public, max-age=300"
+
 # ============================================================================
 # INTERNSHIP DATA
 # ============================================================================
@@ -175,23 +268,31 @@ INTERNSHIPS = [
     }
 ]
 
+
+def catalog_hash(internships: List[Dict]) -> str:
+    """Content hash of the internship catalog; changes whenever any listing changes"""
+    payload = json.dumps(internships, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+CATALOG_VERSION = catalog_hash(INTERNSHIPS)
+
+# Pre-encoded, pre-compressed /internships payload for this catalog version
+catalog_snapshot = CatalogSnapshot(INTERNSHIPS, CATALOG_VERSION)
+
 # ============================================================================
 # TEXT PROCESSING & EMBEDDINGS
 # ============================================================================
 
 def clean_text(text: str) -> str:
-    """Clean and normalize text"""
-    text = text.lower()
-    text = re.sub(r'[^a-z0-9\s]', '', text)
-    text = re.sub(r'\s+', ' ', text).strip()
-    return text
+    """Clean and normalize text (shared with training, see src/tokenizer.py)"""
+    return normalize(text)
 
 
 def hash_based_embedding(text: str, dim: int = 300) -> np.ndarray:
     """Generate deterministic embedding from text hash as fallback"""
-    hash_val = hash(text)
-    np.random.seed(abs(hash_val) % 2**32)
-    return np.random.randn(dim)
+    # A local generator: reseeding numpy's global RNG races between scoring threads
+    return np.random.default_rng(abs(hash(text)) % 2**32).standard_normal(dim)
 
 
 def cosine_similarity(vec1: np.ndarray, vec2: np.ndarray) -> float:
@@ -209,44 +310,74 @@ def cosine_similarity(vec1: np.ndarray, vec2: np.ndarray) -> float:
 # RESUME PARSING
 # ============================================================================
 
-def extract_pdf_text(file_content: bytes) -> str:
-    """Extract text from PDF file"""
+def extract_pdf_text(file: BinaryIO) -> str:
+    """Extract text from PDF file, reading pages straight from the spooled upload"""
     try:
-        from io import BytesIO
-        pdf_reader = PyPDF2.PdfReader(BytesIO(file_content))
+        pdf_reader = PyPDF2.PdfReader(file)
         text = ""
         for page in pdf_reader.pages:
             text += page.extract_text()
         return text
     except Exception as e:
-        logger.error(f"PDF extraction error: {e}")
+        log_event(logger, logging.ERROR, "pdf_extraction_failed", error=str(e))
         return ""
 
 
-def extract_docx_text(file_content: bytes) -> str:
-    """Extract text from DOCX file"""
+def extract_docx_text(file: BinaryIO) -> str:
+    """Extract text from DOCX file, reading straight from the spooled upload"""
     try:
-        from io import BytesIO
-        doc = Document(BytesIO(file_content))
+        doc = Document(file)
         text = "\n".join([para.text for para in doc.paragraphs])
         return text
     except Exception as e:
-        logger.error(f"DOCX extraction error: {e}")
+        log_event(logger, logging.ERROR, "docx_extraction_failed", error=str(e))
         return ""
 
 
-def extract_text_from_resume(filename: str, file_content: bytes) -> str:
+def extract_txt_text(file: BinaryIO) -> str:
+    """Decode a text file chunk by chunk"""
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+    parts = []
+    for chunk in iter(lambda: file.read(READ_CHUNK_SIZE), b''):
+        parts.append(decoder.decode(chunk))
+    parts.append(decoder.decode(b'', final=True))
+    return ''.join(parts)
+
+
+RESUME_EXTENSIONS = ('.pdf', '.docx', '.doc', '.txt')
+
+
+def extract_text_from_resume(filename: str, file: BinaryIO) -> str:
     """Extract text from resume based on file type"""
+    file.seek(0)
     if filename.lower().endswith('.pdf'):
-        return extract_pdf_text(file_content)
+        return extract_pdf_text(file)
     elif filename.lower().endswith(('.docx', '.doc')):
-        return extract_docx_text(file_content)
+        return extract_docx_text(file)
     elif filename.lower().endswith('.txt'):
-        return file_content.decode('utf-8', errors='ignore')
+        return extract_txt_text(file)
     else:
         raise ValueError(f"Unsupported file type: {filename}")
 
 
+def upload_size(upload: UploadFile) -> int:
+    """Size of an uploaded file without reading it into memory"""
+    upload.file.seek(0, os.SEEK_END)
+    size = upload.file.tell()
+    upload.file.seek(0)
+    return size
+
+
+def take_upload(upload: UploadFile) -> BinaryIO:
+    """
+    Detach the spooled file from an UploadFile so it outlives the request handler.
+    FastAPI closes form uploads when the endpoint returns, before a streamed body
+    runs; the caller owns the returned file and must close it.
+    """
+    spooled, upload.file = upload.file, io.BytesIO()
+    return spooled
+
+
 def extract_skills_from_text(text: str) -> List[str]:
     """Extract likely skills from resume text using regex patterns"""
     skills_keywords = [
@@ -270,30 +401,45 @@ def extract_skills_from_text(text: str) -> List[str]:
 
 
 # ============================================================================
-# WORD2VEC MODEL INITIALIZATION
+# WORD2VEC MODEL & EMBEDDING CACHE
 # ============================================================================
 
-def initialize_word2vec_model():
-    """Initialize Word2Vec model trained on internship descriptions"""
-    try:
-        # Try to load pretrained model if it exists
-        model_path = "models/word2vec_internships.model"
-        if os.path.exists(model_path):
-            model = Word2Vec.load(model_path)
-            logger.info("Loaded existing Word2Vec model")
-            return model
-    except Exception as e:
-        logger.warning(f"Could not load existing model: {e}")
-    
-    # Create a new model with hardcoded internship texts
-    descriptions = []
-    for internship in INTERNSHIPS:
-        text = f"{internship['title']} {internship['description']} {' '.join(internship['technologies'])}"
-        descriptions.append(text)
-    
-    internship_texts = [text.lower().split() for text in descriptions]
+# The trained vectors and internship embeddings are persisted under the catalog's
+# content hash, so restarts and reloads load them instead of retraining. A new
+# catalog version is trained once, in the background, by whichever worker takes
+# the build lock; the others wait for its files. A failed build is retried with
+# exponential backoff, and /health reports it until a build succeeds.
+MODEL_CACHE_DIR = Path(os.getenv("MODEL_CACHE_DIR", str(Path(__file__).resolve().parent / "models")))
+BUILD_LOCK_STALE_SECONDS = float(os.getenv("BUILD_LOCK_STALE_SECONDS", "600"))
+BUILD_RETRY_BASE_SECONDS = float(os.getenv("BUILD_RETRY_BASE_SECONDS", "5"))
+BUILD_RETRY_MAX_SECONDS = float(os.getenv("BUILD_RETRY_MAX_SECONDS", "300"))
+WARMING_RETRY_AFTER = 5
+
+
+def internship_fields(internship: Dict) -> Dict[str, str]:
+    """Text of each separately embedded field of an internship"""
+    return {
+        "title": internship['title'],
+        "skills": ", ".join(internship['technologies'] + internship['skills_required']),
+        "description": internship['description'],
+        "location": internship['location']
+    }
+
+
+# Title, description and technologies count equally unless the caller passes weights
+DEFAULT_FIELD_WEIGHTS = {"title": 1.0, "skills": 1.0, "description": 1.0}
+
+
+def internship_text(internship: Dict) -> str:
+    """Text an internship is trained on: every embedded field, so each has vocabulary"""
+    return " ".join(internship_fields(internship).values())
+
+
+def train_word2vec_model(internships: List[Dict]) -> Word2Vec:
+    """Train a Word2Vec model on internship descriptions"""
+    internship_texts = [words(internship_text(internship)) for internship in internships]
     
-    model = Word2Vec(
+    return Word2Vec(
         sentences=internship_texts,
         vector_size=300,  # Embedding dimension
         window=5,
@@ -302,44 +448,88 @@ def initialize_word2vec_model():
         sg=1,  # Skip-gram model
         epochs=10
     )
-    
-    logger.info("Initialized new Word2Vec model")
-    return model
 
 
-# Initialize Word2Vec model
-word2vec_model = initialize_word2vec_model()
-EMBEDDINGS_READY = True
+def artifact_paths(version: str) -> Dict[str, Path]:
+    """Cache files for one catalog version"""
+    return {
+        "vectors": MODEL_CACHE_DIR / f"word2vec_{version}.kv",
+        "fields": MODEL_CACHE_DIR / f"fields_{version}.npz",
+        "lock": MODEL_CACHE_DIR / f"build_{version}.lock"
+    }
+
+
+def load_artifacts(version: str) -> Optional[Tuple[KeyedVectors, FieldMatrix]]:
+    """Cached vectors and internship field embeddings for a catalog version, if complete"""
+    paths = artifact_paths(version)
+    # Field embeddings are written last, so their presence means the set is complete
+    if not paths["fields"].exists():
+        return None
+    try:
+        vectors = KeyedVectors.load(str(paths["vectors"]), mmap="r")
+        fields = FieldMatrix.load(paths["fields"])
+    except Exception as e:
+        log_event(logger, logging.WARNING, "model_cache_load_failed", catalog=version, error=str(e))
+        return None
+    return vectors, fields
+
+
+def save_artifacts(version: str, vectors: KeyedVectors, fields: FieldMatrix):
+    paths = artifact_paths(version)
+    vectors.save(str(paths["vectors"]), sep_limit=0)
+    fields.save(paths["fields"])
+
 
+def acquire_build_lock(path: Path) -> bool:
+    """Take the per-version build lock, breaking it if its holder died mid-build"""
+    try:
+        if time.time() - path.stat().st_mtime > BUILD_LOCK_STALE_SECONDS:
+            path.unlink(missing_ok=True)
+    except FileNotFoundError:
+        pass
+    try:
+        os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        return True
+    except FileExistsError:
+        return False
+
+
+def embed_internships(internships: List[Dict], vectors: KeyedVectors) -> FieldMatrix:
+    """Per-field embeddings of every internship, in catalog order, in one contiguous matrix"""
+    texts = [internship_fields(internship) for internship in internships]
+    names = texts[0].keys() if texts else DEFAULT_FIELD_WEIGHTS.keys()
+    return build_field_matrix(
+        {name: [t[name] for t in texts] for name in names},
+        lambda text: get_text_embedding(text, vectors),
+        dim=300
+    )
 
-def get_text_embedding(text: str) -> np.ndarray:
+
+def get_text_embedding(text: str, vectors: Optional[KeyedVectors] = None) -> np.ndarray:
     """
     Get Word2Vec embedding for text using average of word vectors
     Falls back to hash-based embedding if model fails
     """
+    vectors = vectors if vectors is not None else word2vec_vectors
     try:
-        # Clean and tokenize text
+        # Clean text
         text = clean_text(text)
-        tokens = text.split()
         
-        if not tokens:
+        if not words(text):
             # Return zero vector if no tokens
             return np.zeros(300)
         
-        # Get vectors for each token and average them
-        vectors = []
-        for token in tokens:
-            if token in word2vec_model.wv:
-                vectors.append(word2vec_model.wv[token])
+        # Get vectors for each in-vocabulary phrase and average them
+        token_vectors = [vectors[token] for token in tokenizer_for(vectors).tokenize(text)]
         
-        if vectors:
-            return np.mean(vectors, axis=0)
+        if token_vectors:
+            return np.mean(token_vectors, axis=0)
         else:
             # Fallback: hash-based embedding
             return hash_based_embedding(text, dim=300)
     
     except Exception as e:
-        logger.warning(f"Error computing embedding: {e}. Using fallback.")
+        log_event(logger, logging.WARNING, "embedding_fallback", error=str(e))
         return hash_based_embedding(text, dim=300)
 
 
@@ -350,24 +540,34 @@ def get_text_embedding(text: str) -> np.ndarray:
 class InternshipRecommender:
     """Main recommendation engine using Word2Vec embeddings"""
     
-    def __init__(self, internships: List[Dict]):
+    def __init__(
+        self,
+        internships: List[Dict],
+        vectors: KeyedVectors,
+        fields: Optional[FieldMatrix] = None
+    ):
         self.internships = internships
-        self.internship_embeddings = {}
-        self.precompute_embeddings()
+        self.vectors = vectors
+        self.fields = fields
+        if fields is None:
+            self.precompute_embeddings()
     
     def precompute_embeddings(self):
-        """Precompute embeddings for all internships"""
-        for internship in self.internships:
-            text = f"{internship['title']} {internship['description']} {' '.join(internship['technologies'])}"
-            self.internship_embeddings[internship['id']] = get_text_embedding(text)
-            logger.info(f"Precomputed embedding for {internship['company']} - {internship['title']}")
+        """Precompute per-field embeddings for all internships"""
+        start = time.perf_counter()
+        self.fields = embed_internships(self.internships, self.vectors)
+        log_event(
+            logger, logging.INFO, "embeddings_precomputed",
+            count=len(self.internships), ms=round((time.perf_counter() - start) * 1000, 1)
+        )
     
     def recommend(
         self,
         resume_text: str,
         skills: List[str],
         field: str,
-        top_k: int = 5
+        top_k: int = 5,
+        weights: Optional[Dict[str, float]] = None
     ) -> List[Dict[str, Any]]:
         """
         Recommend top K internships based on user profile
@@ -377,32 +577,154 @@ class InternshipRecommender:
             skills: List of user skills
             field: Field of study
             top_k: Number of recommendations
+            weights: Per-field weights (title, skills, description, location)
         
         Returns:
             List of recommended internships with match scores
         """
         # Combine all user information
         user_text = f"{resume_text} {' '.join(skills)} {field}"
-        user_embedding = get_text_embedding(user_text)
+        user_embedding = get_text_embedding(user_text, self.vectors)
         
-        # Compute similarity scores
-        scores = []
-        for internship in self.internships:
-            internship_embed = self.internship_embeddings[internship['id']]
-            similarity = cosine_similarity(user_embedding, internship_embed)
-            scores.append({
-                **internship,
-                'match_score': max(0, similarity),  # Ensure non-negative
-                'match_percentage': max(0, int(similarity * 100))
-            })
+        # Weighted per-field cosine similarity for every internship in one product
+        stacked = self.fields.stack_queries(user_embedding, weights or DEFAULT_FIELD_WEIGHTS)
+        similarities = self.fields.score(stacked)[0]
         
         # Sort by match score and return top K
-        scores.sort(key=lambda x: x['match_score'], reverse=True)
-        return scores[:top_k]
+        order = np.argsort(-similarities, kind="stable")[:top_k]
+        return [
+            {
+                **self.internships[i],
+                'match_score': max(0, float(similarities[i])),  # Ensure non-negative
+                'match_percentage': max(0, int(similarities[i] * 100))
+            }
+            for i in order.tolist()
+        ]
+
+
+# Serving state for MODEL_VERSION, swapped in as a whole once a build finishes.
+# Until the first one is installed, /recommend answers 503 with Retry-After.
+word2vec_vectors: Optional[KeyedVectors] = None
+recommender: Optional[InternshipRecommender] = None
+MODEL_VERSION: Optional[str] = None
+EMBEDDINGS_READY = False
+# Last failed build of the current catalog, cleared once a model is installed
+BUILD_FAILURE: Optional[Dict[str, Any]] = None
 
 
-# Initialize recommender
-recommender = InternshipRecommender(INTERNSHIPS)
+def install_model(version: str, internships: List[Dict], vectors: KeyedVectors, fields: FieldMatrix):
+    global word2vec_vectors, recommender, MODEL_VERSION, EMBEDDINGS_READY, BUILD_FAILURE
+    recommender = InternshipRecommender(internships, vectors, fields)
+    word2vec_vectors = vectors
+    MODEL_VERSION = version
+    EMBEDDINGS_READY = True
+    BUILD_FAILURE = None
+    log_event(logger, logging.INFO, "model_installed", catalog=version, internships=len(internships))
+
+
+def build_model(version: str, internships: List[Dict], attempt: int = 0):
+    """Background job: load or train the model for a catalog version, then install it"""
+    if version != CATALOG_VERSION:
+        return  # superseded by a newer catalog before this (re)try ran
+    try:
+        artifacts = load_or_train_artifacts(version, internships)
+    except Exception as e:
+        schedule_build_retry(version, internships, attempt, e)
+        return
+    
+    # A newer catalog may have been swapped in while this one was building
+    if version == CATALOG_VERSION:
+        install_model(version, internships, *artifacts)
+
+
+def load_or_train_artifacts(version: str, internships: List[Dict]) -> Tuple[KeyedVectors, FieldMatrix]:
+    MODEL_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    lock_path = artifact_paths(version)["lock"]
+    
+    artifacts = load_artifacts(version)
+    while artifacts is None:
+        if acquire_build_lock(lock_path):
+            try:
+                log_event(logger, logging.INFO, "model_training_started", catalog=version)
+                start = time.perf_counter()
+                vectors = train_word2vec_model(internships).wv
+                fields = embed_internships(internships, vectors)
+                save_artifacts(version, vectors, fields)
+                log_event(
+                    logger, logging.INFO, "model_trained",
+                    catalog=version, vocab=len(vectors), embeddings=len(fields),
+                    ms=round((time.perf_counter() - start) * 1000, 1)
+                )
+                artifacts = vectors, fields
+            finally:
+                lock_path.unlink(missing_ok=True)
+        else:
+            # Another worker is training this version; wait for its files
+            time.sleep(1)
+            artifacts = load_artifacts(version)
+    return artifacts
+
+
+def schedule_build_retry(version: str, internships: List[Dict], attempt: int, error: Exception):
+    """Record a failed build and run it again after an exponential backoff"""
+    global BUILD_FAILURE
+    delay = min(BUILD_RETRY_BASE_SECONDS * 2 ** attempt, BUILD_RETRY_MAX_SECONDS)
+    next_run = datetime.now() + timedelta(seconds=delay)
+    BUILD_FAILURE = {
+        "catalog_version": version,
+        "attempts": attempt + 1,
+        "error": str(error),
+        "next_retry": next_run.isoformat()
+    }
+    log_event(
+        logger, logging.ERROR, "model_build_failed",
+        catalog=version, attempt=attempt + 1, error=str(error), retry_in_s=delay
+    )
+    scheduler.add_job(
+        build_model,
+        args=[version, internships, attempt + 1],
+        id=f"build_model_{version}_retry{attempt + 1}",
+        next_run_time=next_run,
+        replace_existing=True
+    )
+
+
+def schedule_model_build():
+    """Build the current catalog's model in the background unless it is already serving"""
+    if MODEL_VERSION == CATALOG_VERSION:
+        return
+    scheduler.add_job(
+        build_model,
+        args=[CATALOG_VERSION, INTERNSHIPS],
+        id=f"build_model_{CATALOG_VERSION}",
+        replace_existing=True
+    )
+
+
+def update_catalog(internships: List[Dict]) -> bool:
+    """
+    Swap in a new internship catalog
+    
+    The listing snapshot is rebuilt immediately; the model is retrained in the
+    background only if the catalog content actually changed. Recommendations keep
+    using the previous model until the new one is installed.
+    """
+    global INTERNSHIPS, CATALOG_VERSION, catalog_snapshot
+    version = catalog_hash(internships)
+    if version == CATALOG_VERSION:
+        return False
+    
+    INTERNSHIPS = internships
+    CATALOG_VERSION = version
+    catalog_snapshot = CatalogSnapshot(internships, version)
+    schedule_model_build()
+    return True
+
+
+# Load this catalog's cached model if there is one; otherwise startup builds it
+_cached = load_artifacts(CATALOG_VERSION)
+if _cached is not None:
+    install_model(CATALOG_VERSION, INTERNSHIPS, *_cached)
 
 
 # ============================================================================
@@ -411,22 +733,189 @@ recommender = InternshipRecommender(INTERNSHIPS)
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
-    return {
-        "status": "healthy",
+    """
+    Health check endpoint
+    
+    status is "degraded" when the current catalog's model failed to build but an
+    older model is still serving, and "unhealthy" (503) when nothing can serve.
+    """
+    failure = BUILD_FAILURE if BUILD_FAILURE and BUILD_FAILURE["catalog_version"] == CATALOG_VERSION else None
+    status = "healthy"
+    if failure is not None:
+        status = "degraded" if recommender is not None else "unhealthy"
+    body = {
+        "status": status,
         "timestamp": datetime.utcnow().isoformat(),
         "total_internships": len(INTERNSHIPS),
         "embeddings_ready": EMBEDDINGS_READY,
-        "embedding_model": "Word2Vec"
+        "catalog_version": CATALOG_VERSION,
+        "model_version": MODEL_VERSION,
+        "embedding_model": "Word2Vec",
+        "in_flight": upload_admission.in_flight,
+        "queue_depth": upload_admission.queue_depth
     }
+    if failure is not None:
+        body["model_build"] = failure
+    if status == "unhealthy":
+        return JSONResponse(body, status_code=503)
+    return body
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Admission queue depth and in-flight work in Prometheus text format (for autoscaling)"""
+    return render_metrics(upload_transfers, upload_admission)
 
 
 @app.get("/internships")
-async def get_internships():
-    """Get all available internships"""
+async def get_internships(
+    request: Request,
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to include")
+):
+    """
+    Get available internships
+    
+    The full listing is served from buffers encoded and compressed once per catalog
+    version (gzip/brotli by Accept-Encoding). Pages and field projections are
+    spliced from pre-encoded row fragments.
+    """
+    snapshot = catalog_snapshot
+    if offset == 0 and limit is None and fields is None:
+        return snapshot.full_response(request, INTERNSHIPS_CACHE_CONTROL)
+    
+    selected = None
+    if fields is not None:
+        selected = [f.strip() for f in fields.split(',') if f.strip()]
+        unknown = [f for f in selected if f not in snapshot.fields]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    
+    key = (offset, limit, tuple(selected) if selected is not None else None)
+    cached = response_cache.get_or_build(
+        snapshot.version,
+        key,
+        lambda: snapshot.page(offset, limit, selected)
+    )
+    return cached.to_response(request, INTERNSHIPS_CACHE_CONTROL)
+
+
+def check_recommend_request(
+    current: Optional[InternshipRecommender],
+    fullName: str,
+    email: str,
+    fieldOfStudy: str,
+    resume: UploadFile,
+    weights: Optional[str]
+) -> Tuple[int, Optional[Dict[str, float]]]:
+    """Validation shared by the recommend endpoints; returns the resume size and field weights"""
+    if current is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Recommendation model build failed, retrying" if BUILD_FAILURE else "Recommendation model is warming up",
+            headers={"Retry-After": str(WARMING_RETRY_AFTER)}
+        )
+    
+    # Validate inputs
+    if not fullName or not email or not fieldOfStudy:
+        raise HTTPException(status_code=400, detail="Missing required fields")
+    if not (resume.filename or "").lower().endswith(RESUME_EXTENSIONS):
+        raise HTTPException(status_code=400, detail=f"Unsupported file type: {resume.filename}")
+    
+    field_weights = None
+    if weights:
+        try:
+            field_weights = parse_weights(weights)
+            current.fields.weight_vector(field_weights)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    # Check the spooled resume file without loading it
+    size = upload_size(resume)
+    if size == 0:
+        raise HTTPException(status_code=400, detail="Resume file is empty")
+    if size > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="Resume file is too large")
+    
+    return size, field_weights
+
+
+def parse_user_skills(skills: str) -> List[str]:
+    return [s.strip() for s in skills.split(',') if s.strip()]
+
+
+def profile_skills(user_skills: List[str], resume_text: str) -> List[str]:
+    """Form skills plus the skills found in the resume"""
+    return list(set(user_skills + extract_skills_from_text(resume_text)))
+
+
+def log_recommend_request(email: str, all_skills: List[str], size: int):
+    # No names or addresses in logs: a short digest is enough to correlate requests
+    log_event(
+        logger, logging.INFO, "recommend_request",
+        user=hashlib.sha1(email.encode("utf-8")).hexdigest()[:12],
+        skills=len(all_skills), resume_bytes=size
+    )
+
+
+async def rank_profile(
+    current: InternshipRecommender,
+    resume_text: str,
+    all_skills: List[str],
+    fieldOfStudy: str,
+    field_weights: Optional[Dict[str, float]]
+) -> List[Dict[str, Any]]:
+    """Top 5 internships for a profile, scored off the event loop"""
+    return await run_in_threadpool(
+        current.recommend,
+        resume_text=resume_text,
+        skills=all_skills,
+        field=fieldOfStudy,
+        top_k=5,
+        weights=field_weights
+    )
+
+
+def preview_recommendations(
+    current: InternshipRecommender,
+    user_skills: List[str],
+    fieldOfStudy: str,
+    field_weights: Optional[Dict[str, float]]
+) -> List[Dict[str, Any]]:
+    """
+    Top 5 from the form skills and field of study alone, or none when the model knows
+    none of their tokens: the query would then be a hash-based random vector
+    """
+    form_text = clean_text(f"{' '.join(user_skills)} {fieldOfStudy}")
+    if not tokenizer_for(current.vectors).tokenize(form_text):
+        return []
+    return current.recommend(
+        resume_text="",
+        skills=user_skills,
+        field=fieldOfStudy,
+        top_k=5,
+        weights=field_weights
+    )
+
+
+def recommendation_response(
+    fullName: str,
+    email: str,
+    fieldOfStudy: str,
+    all_skills: List[str],
+    recommendations: List[Dict[str, Any]]
+) -> Dict[str, Any]:
     return {
-        "count": len(INTERNSHIPS),
-        "internships": INTERNSHIPS
+        "status": "success",
+        "user": {
+            "name": fullName,
+            "email": email,
+            "field": fieldOfStudy,
+            "skills": all_skills
+        },
+        "recommendations": recommendations,
+        "timestamp": datetime.utcnow().isoformat()
     }
 
 
@@ -436,7 +925,8 @@ async def recommend_internships(
     email: str = Form(...),
     fieldOfStudy: str = Form(...),
     skills: str = Form(...),
-    resume: UploadFile = File(...)
+    resume: UploadFile = File(...),
+    weights: Optional[str] = Form(None)
 ):
     """
     Get internship recommendations based on user profile and resume
@@ -447,72 +937,126 @@ async def recommend_internships(
         fieldOfStudy: Field of study
         skills: Comma-separated skills
         resume: Resume file (PDF, DOCX, TXT)
+        weights: Optional field weights, e.g. "skills:2,title:1"
     
     Returns:
         Top 5 recommended internships with match scores
     """
     try:
-        # Validate inputs
-        if not fullName or not email or not fieldOfStudy:
-            raise HTTPException(status_code=400, detail="Missing required fields")
-        
-        # Read resume file
-        file_content = await resume.read()
-        if not file_content:
-            raise HTTPException(status_code=400, detail="Resume file is empty")
-        
-        # Extract resume text
-        resume_text = extract_text_from_resume(resume.filename, file_content)
-        if not resume_text:
-            raise HTTPException(status_code=400, detail="Could not extract text from resume")
-        
-        # Parse user skills
-        user_skills = [s.strip() for s in skills.split(',') if s.strip()]
-        
-        # Also extract skills from resume
-        extracted_skills = extract_skills_from_text(resume_text)
-        all_skills = list(set(user_skills + extracted_skills))
+        current = recommender
+        size, field_weights = check_recommend_request(current, fullName, email, fieldOfStudy, resume, weights)
         
-        logger.info(f"Recommendation request from {fullName} ({email})")
-        logger.info(f"Detected skills: {all_skills}")
-        
-        # Get recommendations
-        recommendations = recommender.recommend(
-            resume_text=resume_text,
-            skills=all_skills,
-            field=fieldOfStudy,
-            top_k=5
-        )
-        
-        return {
-            "status": "success",
-            "user": {
-                "name": fullName,
-                "email": email,
-                "field": fieldOfStudy,
-                "skills": all_skills
-            },
-            "recommendations": recommendations,
-            "timestamp": datetime.utcnow().isoformat()
-        }
+        # The upload is fully spooled by now; only parsing and scoring hold a slot
+        async with upload_admission.slot():
+            # Extract resume text off the event loop, straight from the spooled file
+            resume_text = await run_in_threadpool(extract_text_from_resume, resume.filename, resume.file)
+            if not resume_text:
+                raise HTTPException(status_code=400, detail="Could not extract text from resume")
+            
+            all_skills = profile_skills(parse_user_skills(skills), resume_text)
+            log_recommend_request(email, all_skills, size)
+            
+            # Get recommendations
+            recommendations = await rank_profile(current, resume_text, all_skills, fieldOfStudy, field_weights)
+        return recommendation_response(fullName, email, fieldOfStudy, all_skills, recommendations)
     
-    except HTTPException:
+    except (HTTPException, Overloaded):
         raise
     except Exception as e:
-        logger.error(f"Error in recommendation: {e}")
+        log_event(logger, logging.ERROR, "recommend_failed", error=str(e))
         raise HTTPException(status_code=500, detail=f"Error processing recommendation: {str(e)}")
 
 
+def stream_event(name: str, data: Dict[str, Any], sse: bool) -> bytes:
+    """One NDJSON line, or one Server-Sent Event"""
+    if sse:
+        return f"event: {name}\ndata: {json.dumps(data)}\n\n".encode("utf-8")
+    return (json.dumps({"event": name, **data}) + "\n").encode("utf-8")
+
+
+@app.post("/recommend/stream")
+async def recommend_internships_stream(
+    request: Request,
+    fullName: str = Form(...),
+    email: str = Form(...),
+    fieldOfStudy: str = Form(...),
+    skills: str = Form(...),
+    resume: UploadFile = File(...),
+    weights: Optional[str] = Form(None)
+):
+    """
+    Streaming variant of /recommend
+    
+    Sends newline-delimited JSON, or Server-Sent Events when the client accepts
+    text/event-stream. Events, in order:
+        received - upload accepted
+        preview  - first results from the form skills and field of study alone,
+                   sent before the resume is parsed; empty when the model knows
+                   none of their words
+        parsed   - resume text extracted
+        skills   - skills detected from the form and the resume
+        results  - the final response, ranked exactly as POST /recommend
+    Invalid requests fail with the same status codes as /recommend; failures after
+    streaming has started, including being shed while waiting for a processing
+    slot (429/503), are sent as an error event with status and detail.
+    """
+    current = recommender
+    size, field_weights = check_recommend_request(current, fullName, email, fieldOfStudy, resume, weights)
+    user_skills = parse_user_skills(skills)
+    sse = "text/event-stream" in request.headers.get("accept", "")
+    filename, resume_file = resume.filename, take_upload(resume)
+    
+    async def events():
+        yield stream_event("received", {"resume_bytes": size}, sse)
+        try:
+            async with upload_admission.slot():
+                preview = await run_in_threadpool(
+                    preview_recommendations, current, user_skills, fieldOfStudy, field_weights
+                )
+                yield stream_event("preview", {"recommendations": preview}, sse)
+                
+                resume_text = await run_in_threadpool(extract_text_from_resume, filename, resume_file)
+                if not resume_text:
+                    yield stream_event("error", {"status": 400, "detail": "Could not extract text from resume"}, sse)
+                    return
+                yield stream_event("parsed", {"characters": len(resume_text)}, sse)
+                
+                all_skills = profile_skills(user_skills, resume_text)
+                yield stream_event("skills", {"skills": all_skills}, sse)
+                log_recommend_request(email, all_skills, size)
+                
+                recommendations = await rank_profile(current, resume_text, all_skills, fieldOfStudy, field_weights)
+                yield stream_event(
+                    "results",
+                    recommendation_response(fullName, email, fieldOfStudy, all_skills, recommendations),
+                    sse
+                )
+        except Overloaded as e:
+            yield stream_event("error", {"status": e.status_code, "detail": e.detail, "retry_after": e.retry_after}, sse)
+        except Exception as e:
+            log_event(logger, logging.ERROR, "recommend_failed", error=str(e))
+            yield stream_event("error", {"status": 500, "detail": f"Error processing recommendation: {str(e)}"}, sse)
+        finally:
+            resume_file.close()
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream" if sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 # ============================================================================
 # STARTUP & SHUTDOWN
 # ============================================================================
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize scheduler on startup"""
+    """Initialize scheduler on startup and build the model if none is cached"""
     if not scheduler.running:
         scheduler.start()
-    logger.info("Application started with Word2Vec embeddings")
+    schedule_model_build()
+    log_event(logger, logging.INFO, "startup", catalog=CATALOG_VERSION, model_ready=EMBEDDINGS_READY)
 
 
 @app.on_event("shutdown")
@@ -520,7 +1064,7 @@ async def shutdown_event():
     """Shutdown scheduler on app shutdown"""
     if scheduler.running:
         scheduler.shutdown()
-    logger.info("Application shutdown")
+    log_event(logger, logging.INFO, "shutdown")
 
 
 if __name__ == "__main__":
@@ -1,11 +1,17 @@
 #!/usr/bin/env python3
 """Entry point for the Internship Recommender backend"""
 
+from pathlib import Path
+
 import uvicorn
 
+# The backend imports shared modules from src/, so it runs from the repository root
+ROOT = Path(__file__).resolve().parent.parent
+
 if __name__ == "__main__":
     uvicorn.run(
-        "backend:app",
+        "backend.backend:app",
+        app_dir=str(ROOT),
         host="0.0.0.0",
         port=8000,
         reload=True,
@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+End-to-end HTTP load test for the recommender services.
+
+Starts src/api.py and/or backend/backend.py locally with uvicorn, generates a
+resume corpus (PDF, DOCX and TXT), replays a weighted query mix at a fixed
+concurrency (closed loop) or a fixed arrival rate (open loop), and writes a
+JSON report with requests/second and p50/p95/p99 latency per endpoint.
+Open-loop latency is measured from each request's scheduled send time, so a
+stalled server shows up as queueing delay instead of silently lowering load.
+
+Run from the repository root:
+    python benchmarks/loadtest.py --target both --concurrency 16 --duration 30 --out report.json
+    python benchmarks/loadtest.py --target api --rate 200 --duration 30 --compare report.json
+"""
+import argparse
+import http.client
+import io
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlparse
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def responds(status: int, body: bytes) -> bool:
+    return status < 500
+
+
+def model_installed(status: int, body: bytes) -> bool:
+    # /health answers 200 while the model is still training; /recommend would 503 until then
+    return status == 200 and json.loads(body).get("embeddings_ready") is True
+
+
+# app, readiness path, readiness check on (status, body)
+APPS = {
+    "api": ("src.api:app", "/", responds),
+    "backend": ("backend.backend:app", "/health", model_installed),
+}
+
+SKILLS = [
+    "python", "java", "javascript", "react", "node", "django", "flask", "fastapi", "sql",
+    "postgresql", "mongodb", "docker", "kubernetes", "aws", "azure", "git", "machine learning",
+    "deep learning", "tensorflow", "pytorch", "data science", "html", "css", "typescript",
+    "golang", "rust", "microservices", "distributed systems", "data analytics", "flutter",
+]
+FIELDS = ["Computer Science", "Data Science", "Electrical Engineering", "Information Technology"]
+
+
+# ============================================================================
+# RESUME CORPUS
+# ============================================================================
+
+def resume_text(rng: random.Random) -> str:
+    skills = rng.sample(SKILLS, rng.randint(4, 10))
+    lines = [
+        "Jane Doe - Software Engineering Student",
+        "Skills: " + ", ".join(skills),
+        "Projects:",
+    ]
+    for skill in skills[:4]:
+        lines.append(f"- Built a {skill} project covering testing, deployment and documentation.")
+    lines += ["Experience: teaching assistant, hackathon winner, open source contributor."] * rng.randint(1, 20)
+    return "\n".join(lines)
+
+
+def _pdf_escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(text: str) -> bytes:
+    """Minimal single-page PDF with one Helvetica text line per input line."""
+    lines = text.splitlines()[:60]
+    stream = "BT /F1 10 Tf 50 780 Td 12 TL " + " ".join(f"({_pdf_escape(l)}) '" for l in lines) + " ET"
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        "/Resources << /Font << /F1 5 0 R >> >> >>",
+        f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for i, obj in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f"{i} 0 obj\n{obj}\nendobj\n".encode("latin-1"))
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    for off in offsets:
+        out.write(f"{off:010d} 00000 n \n".encode())
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return out.getvalue()
+
+
+def make_docx(text: str) -> bytes:
+    from docx import Document
+
+    doc = Document()
+    for line in text.splitlines():
+        doc.add_paragraph(line)
+    out = io.BytesIO()
+    doc.save(out)
+    return out.getvalue()
+
+
+def build_resume_corpus(size: int, seed: int, formats: List[str]) -> List[Tuple[str, bytes, str]]:
+    """(filename, content, content_type) triples, cycling through formats."""
+    rng = random.Random(seed)
+    makers = {
+        "pdf": (make_pdf, "application/pdf"),
+        "docx": (make_docx, "application/vnd.openxmlformats-officedocument.wordprocessingml.document"),
+        "txt": (lambda t: t.encode("utf-8"), "text/plain"),
+    }
+    corpus = []
+    for i in range(size):
+        fmt = formats[i % len(formats)]
+        make, content_type = makers[fmt]
+        corpus.append((f"resume_{i}.{fmt}", make(resume_text(rng)), content_type))
+    return corpus
+
+
+def multipart(fields: Dict[str, str], file_field: str, filename: str, content: bytes, content_type: str):
+    boundary = uuid.uuid4().hex
+    out = io.BytesIO()
+    for name, value in fields.items():
+        out.write(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    out.write(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{file_field}"; filename="{filename}"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n".encode()
+    )
+    out.write(content)
+    out.write(f"\r\n--{boundary}--\r\n".encode())
+    return out.getvalue(), f"multipart/form-data; boundary={boundary}"
+
+
+# ============================================================================
+# QUERY MIX
+# ============================================================================
+
+@dataclass
+class RequestSpec:
+    name: str
+    method: str
+    path: str
+    body: Optional[bytes] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+def api_requests(rng: random.Random, cache_bust: bool) -> Callable[[], RequestSpec]:
+    def make() -> RequestSpec:
+        query = " ".join(rng.sample(SKILLS, rng.randint(1, 4)))
+        if cache_bust:
+            query += f" {uuid.uuid4().hex[:8]}"  # OOV token: same ranking, new cache key
+        return RequestSpec("api GET /recommend", "GET", "/recommend?" + urlencode({"skill": query}))
+    return make
+
+
+def backend_requests(rng: random.Random, corpus) -> Callable[[], RequestSpec]:
+    def make() -> RequestSpec:
+        filename, content, content_type = rng.choice(corpus)
+        fmt = filename.rsplit(".", 1)[-1]
+        body, ctype = multipart(
+            {
+                "fullName": "Load Test",
+                "email": "loadtest@example.com",
+                "fieldOfStudy": rng.choice(FIELDS),
+                "skills": ", ".join(rng.sample(SKILLS, 3)),
+            },
+            "resume", filename, content, content_type,
+        )
+        return RequestSpec(f"backend POST /recommend ({fmt})", "POST", "/recommend", body, {"Content-Type": ctype})
+    return make
+
+
+# ============================================================================
+# SERVERS
+# ============================================================================
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(target: str, workers: int) -> Tuple[subprocess.Popen, str]:
+    app, ready_path, is_ready = APPS[target]
+    port = free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", app, "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=ROOT,
+        env={**os.environ, "PYTHONPATH": str(ROOT)},
+    )
+    base = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 120
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"{target} server exited with code {proc.returncode}")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            conn.request("GET", ready_path)
+            response = conn.getresponse()
+            if is_ready(response.status, response.read()):
+                return proc, base
+        except (OSError, ValueError):
+            pass
+        time.sleep(0.25)
+    proc.terminate()
+    raise RuntimeError(f"{target} server did not become ready")
+
+
+# ============================================================================
+# LOAD GENERATION
+# ============================================================================
+
+class Recorder:
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+        self.statuses: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, latency: float, status: str) -> None:
+        with self._lock:
+            self.samples.setdefault(name, []).append(latency)
+            counts = self.statuses.setdefault(name, {})
+            counts[status] = counts.get(status, 0) + 1
+
+
+class Client:
+    """One keep-alive connection per thread and base URL."""
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def send(self, base: str, spec: RequestSpec) -> int:
+        conns = self._local.__dict__.setdefault("conns", {})
+        conn = conns.get(base)
+        if conn is None:
+            parsed = urlparse(base)
+            conn = conns[base] = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=self.timeout)
+        try:
+            conn.request(spec.method, spec.path, body=spec.body, headers=spec.headers)
+            response = conn.getresponse()
+            response.read()
+            return response.status
+        except Exception:
+            conn.close()
+            conns.pop(base, None)
+            raise
+
+
+def pick(mix: List[Tuple[float, str, Callable[[], RequestSpec]]], rng: random.Random):
+    _, base, make = rng.choices(mix, weights=[w for w, _, _ in mix])[0]
+    return base, make()
+
+
+def fire(client: Client, recorder: Recorder, base: str, spec: RequestSpec, scheduled: float) -> None:
+    try:
+        status = str(client.send(base, spec))
+    except Exception as e:
+        status = type(e).__name__
+    recorder.record(spec.name, time.perf_counter() - scheduled, status)
+
+
+def run_closed_loop(mix, concurrency: int, duration: float, client: Client, seed: int) -> Tuple[Recorder, float]:
+    recorder = Recorder()
+    deadline = time.perf_counter() + duration
+
+    def worker(i: int) -> None:
+        rng = random.Random(seed + i)
+        while time.perf_counter() < deadline:
+            base, spec = pick(mix, rng)
+            fire(client, recorder, base, spec, time.perf_counter())
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return recorder, time.perf_counter() - start
+
+
+def run_open_loop(mix, rate: float, duration: float, client: Client, seed: int, max_inflight: int):
+    recorder = Recorder()
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    next_at = start
+    with ThreadPoolExecutor(max_workers=max_inflight) as pool:
+        while next_at < start + duration:
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            base, spec = pick(mix, rng)
+            pool.submit(fire, client, recorder, base, spec, next_at)
+            next_at += rng.expovariate(rate)  # Poisson arrivals
+    return recorder, time.perf_counter() - start
+
+
+# ============================================================================
+# REPORTING
+# ============================================================================
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    # nearest-rank percentile
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(recorder: Recorder, elapsed: float, config: Dict) -> Dict:
+    endpoints = {}
+    for name, samples in sorted(recorder.samples.items()):
+        values = sorted(samples)
+        statuses = recorder.statuses[name]
+        ok = sum(n for s, n in statuses.items() if s.startswith("2") or s == "304")
+        endpoints[name] = {
+            "requests": len(values),
+            "ok": ok,
+            "errors": len(values) - ok,
+            "statuses": statuses,
+            "rps": round(len(values) / elapsed, 2),
+            "latency_ms": {
+                "mean": round(1000 * sum(values) / len(values), 2),
+                "p50": round(1000 * percentile(values, 50), 2),
+                "p95": round(1000 * percentile(values, 95), 2),
+                "p99": round(1000 * percentile(values, 99), 2),
+                "max": round(1000 * values[-1], 2),
+            },
+        }
+    return {"config": config, "elapsed_s": round(elapsed, 2), "endpoints": endpoints}
+
+
+def print_report(report: Dict, baseline: Optional[Dict] = None) -> None:
+    header = f"{'endpoint':38} {'reqs':>7} {'err':>5} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, ep in report["endpoints"].items():
+        lat = ep["latency_ms"]
+        print(f"{name:38} {ep['requests']:7d} {ep['errors']:5d} {ep['rps']:8.1f} "
+              f"{lat['p50']:8.1f} {lat['p95']:8.1f} {lat['p99']:8.1f}")
+        base = (baseline or {}).get("endpoints", {}).get(name)
+        if base:
+            def delta(new, old):
+                return f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+            print(f"{'  vs baseline':38} {'':7} {'':5} {delta(ep['rps'], base['rps']):>8} "
+                  f"{delta(lat['p50'], base['latency_ms']['p50']):>8} "
+                  f"{delta(lat['p95'], base['latency_ms']['p95']):>8} "
+                  f"{delta(lat['p99'], base['latency_ms']['p99']):>8}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the recommender services locally")
+    parser.add_argument("--target", choices=["api", "backend", "both"], default="both")
+    parser.add_argument("--api-url", help="Use an already running src/api.py instead of starting one")
+    parser.add_argument("--backend-url", help="Use an already running backend instead of starting one")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers per started server")
+    parser.add_argument("--concurrency", type=int, default=8, help="Closed-loop client threads")
+    parser.add_argument("--rate", type=float, default=None, help="Open-loop arrivals per second (overrides --concurrency)")
+    parser.add_argument("--max-inflight", type=int, default=256, help="Open-loop in-flight request cap")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of load")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Seconds of unrecorded load first")
+    parser.add_argument("--api-weight", type=float, default=1.0)
+    parser.add_argument("--backend-weight", type=float, default=1.0)
+    parser.add_argument("--resumes", type=int, default=30, help="Generated resumes in the corpus")
+    parser.add_argument("--formats", default="pdf,docx,txt")
+    parser.add_argument("--cache-bust", action="store_true", help="Make every api query miss the response cache")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", type=Path, help="Write the JSON report here")
+    parser.add_argument("--compare", type=Path, help="Earlier JSON report to diff against")
+    args = parser.parse_args()
+
+    procs = []
+    try:
+        rng = random.Random(args.seed)
+        mix = []
+        if args.target in ("api", "both"):
+            base = args.api_url
+            if base is None:
+                proc, base = start_server("api", args.workers)
+                procs.append(proc)
+            mix.append((args.api_weight, base, api_requests(rng, args.cache_bust)))
+        if args.target in ("backend", "both"):
+            base = args.backend_url
+            if base is None:
+                proc, base = start_server("backend", args.workers)
+                procs.append(proc)
+            corpus = build_resume_corpus(args.resumes, args.seed, args.formats.split(","))
+            mix.append((args.backend_weight, base, backend_requests(rng, corpus)))
+
+        client = Client(args.timeout)
+
+        def run(duration: float):
+            if args.rate:
+                return run_open_loop(mix, args.rate, duration, client, args.seed, args.max_inflight)
+            return run_closed_loop(mix, args.concurrency, duration, client, args.seed)
+
+        if args.warmup > 0:
+            run(args.warmup)
+        recorder, elapsed = run(args.duration)
+    finally:
+        for proc in procs:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+    config = {k: (str(v) if isinstance(v, Path) else v) for k, v in vars(args).items()}
+    config["mode"] = "open" if args.rate else "closed"
+    report = summarize(recorder, elapsed, config)
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    print_report(report, baseline)
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2))
+        print(f"Report written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -98,39 +98,12 @@ base_url = "https://internshala.com/internships/backend-development-internship"
 #     time.sleep(1)  # be polite — delay between requests
 
 #NEW LOOP FOR FIXING THE SKILLS SPACEING ISSUE
-for page in range(1, 9):
-    url = f"{base_url}/page-{page}"
-    print("Scraping:", url)
-    res = requests.get(url, headers={"User-Agent": "Mozilla/5.0"})
-    soup = BeautifulSoup(res.text, 'html.parser')
-
-    internships = soup.find_all('div', class_='individual_internship')
-
-    for intern in internships:
-        title = intern.find('h3', class_='job-internship-name')
-        company = intern.find('p', class_='company-name')
-        location = intern.find('div', class_='row-1-item locations')
-
-        # ✅ FIX HERE
-        skills_tags = intern.find_all('span', class_='round_tabs')
-        skill_list = [s.text.strip() for s in skills_tags]
-        skill_str = ', '.join(skill_list)
-
-        titles.append(title.text.strip() if title else "")
-        companies.append(company.text.strip() if company else "")
-        locations.append(location.text.strip() if location else "")
-        skills.append(skill_str)
-
-    time.sleep(1)
-
-# print(title)
-# save to DataFrame
-new_df = pd.DataFrame({
-    'Title': titles,
-    'Company': companies,
-    'Location': locations,
-    'Skills': skills
-})
+# Now lives in src/scraper.py: pooled + rate-limited fetches, retries, and rows streamed to disk
+# Each run overwrites internships_scraped.csv, so new_df holds only this run's rows
+from src.scraper import scrape
+
+scrape(["backend-development"], pages=8, out_path="Z:\Python\Internship_Recommender\data\internships_scraped.csv")
+new_df = pd.read_csv("Z:\Python\Internship_Recommender\data\internships_scraped.csv")
 #Appending the new scraped data to old one
 updated_df = pd.concat([existing_df, new_df], ignore_index=True)
 updated_df.to_csv("Z:\Python\Internship_Recommender\data\internships_NEW.csv", index=False)
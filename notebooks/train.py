@@ -88,33 +88,89 @@
 
 
 
+# ==============================
+# Streaming + incremental training
+# ==============================
+# Run from the repository root so src/ is importable:
+# Full retrain:   python -m notebooks.train src/data/internships.parquet
+# Add a new day:  python -m notebooks.train src/data/internships_2025-10-24.csv --update --epochs 5
+# The corpus is re-read from disk on every pass, so it never has to fit in memory,
+# and --update only trains on the new listings instead of starting from scratch.
+
+import argparse
+import logging
+import os
+from pathlib import Path
+
 import pandas as pd
+import pyarrow.parquet as pq
 from gensim.models import Word2Vec
-import re
-
-# Load data
-df = pd.read_csv(r"Z:\Python\Internship_Recommender\data\internship_finalP_dataset.csv")  # assuming column 'skills'
-
-# Preprocess skills column
-def clean_skills(skill_str):
-    # Lowercase
-    skill_str = str(skill_str).lower()
-    # Remove unwanted chars
-    skill_str = re.sub(r'[^a-zA-Z0-9, ]', '', skill_str)
-    # Split by comma and strip whitespace
-    skills = [s.strip() for s in skill_str.split(',') if s.strip()]
-    return skills
-
-df['skills_list'] = df['Skills'].apply(clean_skills)
-
-# Prepare data for Word2Vec
-sentences = df['skills_list'].tolist()
-
-# Train Word2Vec
-model = Word2Vec(sentences, vector_size=100, window=5, min_count=1, workers=4)
-
-model.save(r"Z:\Python\Internship_Recommender\models\internship_word2vec.model")
-print("✅ Word2Vec model trained and saved as 'internship_word2vec.model'")
 
-# Example: most similar skills to Python
-print(model.wv.most_similar('python',topn=10))
\ No newline at end of file
+from src.tokenizer import split_phrases
+
+ROOT = Path(__file__).resolve().parent.parent
+MODEL_PATH = ROOT / "src" / "models" / "internship_word2vec.model"
+
+
+class SkillCorpus:
+    """
+    Restartable iterator over the Skills column of chunked CSV/Parquet files.
+    Every __iter__ starts a fresh read, which is what gensim needs for multiple epochs.
+    """
+
+    def __init__(self, paths, chunksize=10_000):
+        self.paths = [Path(p) for p in paths]
+        self.chunksize = chunksize
+
+    def _skill_chunks(self, path):
+        if path.suffix == ".parquet":
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=self.chunksize, columns=["Skills"]):
+                yield batch.column(0).to_pylist()
+        else:
+            for chunk in pd.read_csv(path, usecols=["Skills"], chunksize=self.chunksize):
+                yield chunk["Skills"].dropna().tolist()
+
+    def __iter__(self):
+        for path in self.paths:
+            for skills in self._skill_chunks(path):
+                for skill_str in skills:
+                    # same phrase split serving uses (src/tokenizer.py), so tokens match exactly
+                    sentence = split_phrases(skill_str)
+                    if sentence:
+                        yield sentence
+
+
+def train(paths, model_path=MODEL_PATH, update=False, epochs=None, workers=None):
+    corpus = SkillCorpus(paths)
+    workers = workers or os.cpu_count() or 4
+
+    if update:
+        # Extend the vocabulary with new skills, then train on the new listings only
+        model = Word2Vec.load(str(model_path))
+        model.workers = workers
+        model.build_vocab(corpus, update=True)
+    else:
+        model = Word2Vec(vector_size=100, window=5, min_count=1, workers=workers)
+        model.build_vocab(corpus)
+
+    model.train(corpus, total_examples=model.corpus_count, epochs=epochs or model.epochs)
+    model.save(str(model_path))
+    return model
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train or update the internship Word2Vec model")
+    parser.add_argument("data", nargs="+", help="CSV or Parquet files with a Skills column")
+    parser.add_argument("--model", type=Path, default=MODEL_PATH)
+    parser.add_argument("--update", action="store_true", help="Continue training an existing model on new data")
+    parser.add_argument("--epochs", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None, help="Defaults to all cores")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    model = train(args.data, args.model, update=args.update, epochs=args.epochs, workers=args.workers)
+    print(f"✅ Word2Vec model {'updated' if args.update else 'trained'} and saved as '{args.model}'")
+
+    # Example: most similar skills to Python
+    if 'python' in model.wv:
+        print(model.wv.most_similar('python', topn=10))
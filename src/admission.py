@@ -0,0 +1,166 @@
+# src/admission.py
+"""
+Admission control and load shedding.
+
+An AdmissionController admits up to max_concurrent requests, parks up to
+max_queue more in FIFO order, and sheds everything else immediately with 429.
+A parked request that is not admitted within queue_timeout gets a 503. Both
+carry Retry-After, estimated from recent service times. Queue depth, in-flight
+work and rejection counts are rendered in Prometheus text format for autoscaling.
+"""
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Deque, Iterable
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+
+class Overloaded(Exception):
+    """Raised when a request is shed; status_code is 429 (queue full) or 503 (queue timeout)."""
+
+    def __init__(self, status_code: int, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+    def to_response(self) -> JSONResponse:
+        return JSONResponse(
+            {"detail": self.detail},
+            status_code=self.status_code,
+            headers={"Retry-After": str(self.retry_after)},
+        )
+
+
+async def overloaded_handler(request: Request, exc: Overloaded) -> JSONResponse:
+    """FastAPI exception handler for Overloaded."""
+    return exc.to_response()
+
+
+class AdmissionController:
+    """Concurrency limiter with a bounded FIFO wait queue. Use from a single event loop."""
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int, queue_timeout: float):
+        self.name = name
+        self.max_concurrent = max(int(max_concurrent), 1)
+        self.max_queue = max(int(max_queue), 0)
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.rejected = {"queue_full": 0, "queue_timeout": 0}
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._service_time = 0.1  # EWMA of seconds per admitted request
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self) -> int:
+        backlog = (self.queue_depth + 1) / self.max_concurrent
+        return max(1, math.ceil(backlog * self._service_time))
+
+    async def acquire(self) -> None:
+        if self.in_flight < self.max_concurrent and not self._waiters:
+            self.in_flight += 1
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            self.rejected["queue_full"] += 1
+            raise Overloaded(429, f"{self.name} is at capacity, try again later", self.retry_after())
+
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        try:
+            await asyncio.wait_for(asyncio.shield(fut), self.queue_timeout)
+        except asyncio.TimeoutError:
+            if fut.done() and not fut.cancelled():
+                return  # the slot was handed over right at the deadline
+            self._remove(fut)
+            self.rejected["queue_timeout"] += 1
+            raise Overloaded(503, f"{self.name} queue wait exceeded, try again later", self.retry_after())
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self.release()
+            else:
+                self._remove(fut)
+            raise
+
+    def _remove(self, fut: asyncio.Future) -> None:
+        fut.cancel()
+        try:
+            self._waiters.remove(fut)
+        except ValueError:
+            pass
+
+    def observe(self, elapsed: float) -> None:
+        """Fold one request's service time into the Retry-After estimate."""
+        self._service_time = 0.8 * self._service_time + 0.2 * elapsed
+
+    def release(self) -> None:
+        # hand the slot straight to the oldest live waiter, if any
+        while self._waiters:
+            fut = self._waiters.popleft()
+            if not fut.done():
+                fut.set_result(None)
+                return
+        self.in_flight -= 1
+
+    @asynccontextmanager
+    async def slot(self):
+        await self.acquire()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+            self.release()
+
+
+class AdmissionMiddleware:
+    """ASGI middleware that admits requests to the given paths before their body is read."""
+
+    def __init__(self, app, controller: AdmissionController, paths: Iterable[str]):
+        self.app = app
+        self.controller = controller
+        self.paths = tuple(paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self.controller.acquire()
+        except Overloaded as exc:
+            await exc.to_response()(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.observe(time.perf_counter() - start)
+            self.controller.release()
+
+
+def render_metrics(*controllers: AdmissionController) -> str:
+    """Prometheus text exposition of admission gauges and counters."""
+    lines = [
+        "# HELP admission_in_flight Requests currently being processed.",
+        "# TYPE admission_in_flight gauge",
+    ]
+    lines += [f'admission_in_flight{{limiter="{c.name}"}} {c.in_flight}' for c in controllers]
+    lines += [
+        "# HELP admission_queue_depth Requests waiting for a processing slot.",
+        "# TYPE admission_queue_depth gauge",
+    ]
+    lines += [f'admission_queue_depth{{limiter="{c.name}"}} {c.queue_depth}' for c in controllers]
+    lines += [
+        "# HELP admission_rejected_total Requests shed by admission control.",
+        "# TYPE admission_rejected_total counter",
+    ]
+    for c in controllers:
+        lines += [f'admission_rejected_total{{limiter="{c.name}",reason="{r}"}} {n}' for r, n in c.rejected.items()]
+    return "\n".join(lines) + "\n"
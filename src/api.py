@@ -1,12 +1,26 @@
 # src/api.py
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+from starlette.concurrency import run_in_threadpool
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 import numpy as np
 import pandas as pd
 import pickle
+import hashlib
 import logging
+import os
+import threading
+
+from src.admission import AdmissionController, Overloaded, overloaded_handler, render_metrics
+from src.batching import MicroBatcher
+from src.field_embeddings import FieldMatrix, build_field_matrix, catalog_field_texts, parse_weights
+from src.response_cache import ResponseCache
+from src.sharding import ShardedIndex, ShardsClosed
+from src.similarity import KnnGraph
+from src.skill_index import RelatedSkills, SkillSuggester
+from src.tokenizer import tokenizer_for
 
 # Try to import gensim in a safe way
 try:
@@ -21,8 +35,37 @@ MODEL_DIR = BASE / "models"
 DATA_DIR = BASE / "data"
 
 MODEL_PATH = MODEL_DIR / "internship_word2vec.model"
+# Slim read-only vectors written by `python -m src.export_model`; preferred when present
+SERVING_MODEL_PATH = MODEL_DIR / "internship_vectors.kv"
 VECTORS_PATH = MODEL_DIR / "internship_vectors.pkl"
+# Offline top-k neighbour graph built by `python -m src.similarity`
+KNN_PATH = MODEL_DIR / "internship_knn.npz"
+# Per-field (title/skills/location) embeddings built by `python -m src.field_embeddings`
+FIELDS_PATH = MODEL_DIR / "internship_fields.npz"
 DATA_PATH = DATA_DIR / "internships.csv"
+# Cleaned columnar catalog written by src/cleaning.py; preferred over the CSV when present
+CATALOG_PATH = DATA_DIR / "internships.parquet"
+
+# Admission control for the query path; cache hits bypass it
+RECOMMEND_MAX_CONCURRENCY = int(os.getenv("RECOMMEND_MAX_CONCURRENCY", "16"))
+RECOMMEND_MAX_QUEUE = int(os.getenv("RECOMMEND_MAX_QUEUE", "64"))
+RECOMMEND_QUEUE_TIMEOUT_MS = float(os.getenv("RECOMMEND_QUEUE_TIMEOUT_MS", "500"))
+
+# Micro-batching of concurrent /recommend queries (window 0 disables the wait).
+# Only admitted requests reach the batcher, so a batch never holds more than
+# RECOMMEND_MAX_CONCURRENCY queries; the batch size defaults to that cap.
+BATCH_WINDOW_MS = float(os.getenv("RECOMMEND_BATCH_WINDOW_MS", "2"))
+MAX_BATCH_SIZE = int(os.getenv("RECOMMEND_MAX_BATCH_SIZE", str(RECOMMEND_MAX_CONCURRENCY)))
+
+# Scatter-gather search over SEARCH_SHARDS worker processes (0 or 1 scans in-process).
+# Each shard returns its SEARCH_SHARD_CANDIDATES best rows; more are fetched if
+# title dedup leaves fewer than the requested number of results.
+SEARCH_SHARDS = int(os.getenv("SEARCH_SHARDS", "0"))
+SEARCH_SHARD_CANDIDATES = int(os.getenv("SEARCH_SHARD_CANDIDATES", "50"))
+
+# Versioned response cache for GET /recommend
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "300"))
+RECOMMEND_CACHE_CONTROL = f"public, max-age={int(RESPONSE_CACHE_TTL)}"
 
 app = FastAPI(title="Internship Recommender API")
 
@@ -36,10 +79,58 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+recommend_admission = AdmissionController(
+    "recommend",
+    max_concurrent=RECOMMEND_MAX_CONCURRENCY,
+    max_queue=RECOMMEND_MAX_QUEUE,
+    queue_timeout=RECOMMEND_QUEUE_TIMEOUT_MS / 1000.0,
+)
+app.add_exception_handler(Overloaded, overloaded_handler)
+
 # Globals for lazy loading
 _model = None
 _internship_vectors = None
 _data = None
+_knn_graph = None
+_field_matrix = None
+_shard_index = None
+_skill_suggester = None
+_related_skills = None
+_shard_lock = threading.Lock()
+_snapshot = None
+
+_response_cache = ResponseCache(ttl_seconds=RESPONSE_CACHE_TTL)
+
+def catalog_version() -> str:
+    """
+    Fingerprint of the model, vectors and data files on disk.
+    When it changes, lazily loaded state is dropped so the next request reloads it.
+    """
+    global _snapshot, _model, _internship_vectors, _data, _knn_graph, _field_matrix, _shard_index, _skill_suggester, _related_skills
+    signature = []
+    for path in (MODEL_PATH, SERVING_MODEL_PATH, VECTORS_PATH, CATALOG_PATH, DATA_PATH, KNN_PATH, FIELDS_PATH):
+        if path.exists():
+            st = path.stat()
+            signature.append((path.name, st.st_mtime_ns, st.st_size))
+    version = hashlib.sha1(repr(signature).encode()).hexdigest()[:16]
+
+    if version != _snapshot:
+        if _snapshot is not None:
+            logging.info("Catalog snapshot changed (%s -> %s), reloading", _snapshot, version)
+            _model = None
+            _internship_vectors = None
+            _data = None
+            _knn_graph = None
+            _field_matrix = None
+            _skill_suggester = None
+            _related_skills = None
+            with _shard_lock:
+                retired, _shard_index = _shard_index, None
+            if retired is not None:
+                # close() waits for in-flight searches and joins the workers; keep it off the request path
+                threading.Thread(target=retired.close, name="retire-shards", daemon=True).start()
+        _snapshot = version
+    return version
 
 def load_model():
     global _model
@@ -49,6 +140,11 @@ def load_model():
     if KeyedVectors is None and Word2Vec is None:
         raise RuntimeError("gensim is not available in the environment.")
 
+    if SERVING_MODEL_PATH.exists() and KeyedVectors is not None:
+        # memory-mapped read-only, so workers share the vector pages
+        _model = KeyedVectors.load(str(SERVING_MODEL_PATH), mmap="r")
+        return _model
+
     if not MODEL_PATH.exists():
         raise FileNotFoundError(f"Model file not found at: {MODEL_PATH}")
 
@@ -91,12 +187,80 @@ def load_data():
     if _data is not None:
         return _data
 
+    if CATALOG_PATH.exists():
+        _data = pd.read_parquet(CATALOG_PATH)
+        return _data
+
     if not DATA_PATH.exists():
         raise FileNotFoundError(f"Data CSV not found at: {DATA_PATH}")
 
     _data = pd.read_csv(DATA_PATH)
     return _data
 
+def load_knn_graph() -> KnnGraph:
+    global _knn_graph
+    if _knn_graph is not None:
+        return _knn_graph
+
+    if not KNN_PATH.exists():
+        raise FileNotFoundError(f"kNN graph not found at: {KNN_PATH} (build it with `python -m src.similarity`)")
+
+    _knn_graph = KnnGraph.load(KNN_PATH)
+    return _knn_graph
+
+def load_field_matrix() -> FieldMatrix:
+    """Per-field embeddings from FIELDS_PATH, or built in memory if that file is missing or stale."""
+    global _field_matrix
+    if _field_matrix is not None:
+        return _field_matrix
+
+    data = load_data()
+    if FIELDS_PATH.exists():
+        fields = FieldMatrix.load(FIELDS_PATH)
+        if len(fields) == len(data):
+            _field_matrix = fields
+            return _field_matrix
+        logging.warning("%s does not match the catalog, embedding fields in memory", FIELDS_PATH)
+
+    model_obj = load_model()
+    _field_matrix = build_field_matrix(
+        catalog_field_texts(data),
+        lambda text: get_vector_from_text(model_obj, text),
+        model_obj.vector_size,
+    )
+    return _field_matrix
+
+def load_shard_index() -> Optional[ShardedIndex]:
+    """Sharded search workers over the internship vectors, or None when sharding is off."""
+    global _shard_index
+    if SEARCH_SHARDS <= 1:
+        return None
+    with _shard_lock:
+        if _shard_index is None:
+            _shard_index = ShardedIndex(load_vectors(), SEARCH_SHARDS)
+        return _shard_index
+
+def load_skill_suggester() -> SkillSuggester:
+    global _skill_suggester
+    if _skill_suggester is not None:
+        return _skill_suggester
+
+    model_obj = load_model()
+    wv = model_obj if hasattr(model_obj, "key_to_index") else model_obj.wv
+    data = load_data()
+    skills = data["Skills"].fillna("").astype(str) if "Skills" in data.columns else []
+    _skill_suggester = SkillSuggester(wv.index_to_key, skills)
+    return _skill_suggester
+
+def load_related_skills() -> RelatedSkills:
+    global _related_skills
+    if _related_skills is not None:
+        return _related_skills
+
+    model_obj = load_model()
+    _related_skills = RelatedSkills(model_obj if hasattr(model_obj, "key_to_index") else model_obj.wv)
+    return _related_skills
+
 def get_vector_from_text(model_obj, text: str) -> np.ndarray:
     """Return average vector for words present in model; safe for empty or OOV."""
     if not text or not isinstance(text, str):
@@ -104,18 +268,14 @@ def get_vector_from_text(model_obj, text: str) -> np.ndarray:
         size = getattr(model_obj, "vector_size", None) or getattr(model_obj.wv, "vector_size", None)
         return np.zeros(size, dtype=float)
 
-    text = text.lower().replace(",", " ")
-    words = text.split()
-    vecs = []
     # if we have keyed vectors: model_obj.key_to_index or model_obj.wv
     try:
         wv = model_obj if hasattr(model_obj, "key_to_index") else model_obj.wv
     except Exception:
         wv = model_obj  # best effort
 
-    for w in words:
-        if w in wv:
-            vecs.append(wv[w])
+    # same phrase tokens the model was trained on; only in-vocabulary keys come back
+    vecs = [wv[token] for token in tokenizer_for(wv).tokenize(text)]
 
     if not vecs:
         size = getattr(model_obj, "vector_size", None) or getattr(model_obj.wv, "vector_size", None)
@@ -142,39 +302,249 @@ def cosine_sim_matrix(vecs: np.ndarray, qvec: np.ndarray) -> np.ndarray:
     sims = np.clip(sims, -1.0, 1.0)
     return sims
 
+def cosine_sim_batch(vecs: np.ndarray, queries: np.ndarray) -> np.ndarray:
+    """Batched cosine_sim_matrix: one (batch, n) matrix product for all query rows."""
+    vecs_norm = np.linalg.norm(vecs, axis=1)
+    qnorms = np.linalg.norm(queries, axis=1)
+    denom = np.outer(qnorms, vecs_norm)
+    # zero queries or zero rows -> numerator is 0, so similarity stays 0
+    denom_safe = np.where(denom == 0, 1.0, denom)
+    sims = queries.dot(vecs.T) / denom_safe
+    return np.clip(sims, -1.0, 1.0)
+
+def _search_shards(queries: np.ndarray, k: int):
+    """Sharded search; a reload may retire the index mid-request, so retry once on its replacement."""
+    try:
+        return load_shard_index().search(queries, k)
+    except ShardsClosed:
+        return load_shard_index().search(queries, k)
+
+def _score_batch(queries: np.ndarray):
+    """Full similarity rows, or (candidate ids, similarities) per query when sharded."""
+    if SEARCH_SHARDS > 1:
+        return _search_shards(queries, SEARCH_SHARD_CANDIDATES)
+    return cosine_sim_batch(load_vectors(), queries)
+
+_batcher = MicroBatcher(_score_batch, window_ms=BATCH_WINDOW_MS, max_batch_size=MAX_BATCH_SIZE)
+
+def _score_fields_batch(stacked: np.ndarray) -> np.ndarray:
+    return load_field_matrix().score(stacked)
+
+# Weighted queries are already stacked per request, so any mix of weights shares one product
+_field_batcher = MicroBatcher(_score_fields_batch, window_ms=BATCH_WINDOW_MS, max_batch_size=MAX_BATCH_SIZE)
+
+def top_recommendations(data: pd.DataFrame, sims: np.ndarray, n: int = 5, candidates: Optional[np.ndarray] = None) -> list:
+    """
+    Attach similarities and return the top n rows with unique titles.
+    When candidates is given, sims holds the scores of just those rows.
+    """
+    data = data.copy() if candidates is None else data.iloc[candidates].copy()
+    data["similarity"] = sims
+    # ensure Title column exists
+    if "Title" not in data.columns:
+        raise HTTPException(status_code=500, detail="Data file missing 'Title' column")
+
+    top = (
+        data.sort_values("similarity", ascending=False)
+        .drop_duplicates(subset=["Title"])
+        .head(n)
+    )
+
+    top = top.assign(id=top.index)
+    return top[["id", "Title", "Company", "Location", "similarity"]].to_dict(orient="records")
+
+def _load_and_embed(query: str, by_fields: bool):
+    """
+    Catalog rows, the matrix to score against and the query vector.
+    Loads (and the first tokenizer build) block, so call this from the threadpool.
+    """
+    model_obj = load_model()
+    data = load_data()
+    scoring = load_field_matrix() if by_fields else load_vectors()
+    if len(scoring) != len(data):
+        raise RuntimeError(
+            f"Catalog has {len(data)} rows but {len(scoring)} vectors; "
+            "re-embed the catalog (python -m src.cleaning writes both)"
+        )
+    return data, scoring, get_vector_from_text(model_obj, query)
+
+async def _rank(data: pd.DataFrame, vectors: np.ndarray, qvec: np.ndarray) -> list:
+    """Top recommendations by cosine similarity to the internship vectors."""
+    # starting the shard workers blocks, but with sharding off there is nothing to load
+    index = await run_in_threadpool(load_shard_index) if SEARCH_SHARDS > 1 else None
+    if BATCH_WINDOW_MS > 0:
+        scored = await _batcher.submit(qvec)
+    elif index is not None:
+        scored = (await run_in_threadpool(_search_shards, qvec, SEARCH_SHARD_CANDIDATES))[0]
+    else:
+        scored = await run_in_threadpool(cosine_sim_matrix, vectors, qvec)
+
+    if index is None:
+        return await run_in_threadpool(top_recommendations, data, scored)
+
+    candidates, sims = scored
+    results = await run_in_threadpool(top_recommendations, data, sims, 5, candidates)
+    # duplicate titles ate into the candidates; widen the search until 5 survive
+    while len(results) < 5 and len(candidates) < len(index):
+        candidates, sims = (await run_in_threadpool(_search_shards, qvec, 4 * len(candidates)))[0]
+        results = await run_in_threadpool(top_recommendations, data, sims, 5, candidates)
+    return results
+
+async def _rank_by_fields(data: pd.DataFrame, fields: FieldMatrix, qvec: np.ndarray, weights: dict) -> list:
+    """Top recommendations by weighted per-field similarity, one stacked product."""
+    try:
+        stacked = fields.stack_queries(qvec, weights)[0]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if BATCH_WINDOW_MS > 0:
+        sims = await _field_batcher.submit(stacked)
+    else:
+        sims = (await run_in_threadpool(fields.score, stacked))[0]
+    return await run_in_threadpool(top_recommendations, data, sims)
+
 @app.get("/recommend")
-def recommend(skill: Optional[str] = Query(..., min_length=1, description="Skill or query text")):
+async def recommend(
+    request: Request,
+    skill: Optional[str] = Query(..., min_length=1, description="Skill or query text"),
+    weights: Optional[str] = Query(None, description="Field weights, e.g. skills:2,title:1"),
+):
     """
     Recommend internships similar to the provided skill text.
     Example: /recommend?skill=python%20machine%20learning
+    With weights, internships are ranked by the weighted sum of per-field similarities:
+    /recommend?skill=python&weights=skills:3,title:1
+    Responses are cached per catalog version and carry an ETag for conditional GETs.
+    """
+    version = await run_in_threadpool(catalog_version)
+    query = " ".join(skill.split())
+    field_weights = None
+    if weights is not None:
+        try:
+            field_weights = parse_weights(weights)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    key = query if field_weights is None else (query, tuple(sorted(field_weights.items())))
+    cached = _response_cache.get(version, key)
+    if cached is not None:
+        return cached.to_response(request, RECOMMEND_CACHE_CONTROL)
+
+    async with recommend_admission.slot():
+        try:
+            data, scoring, qvec = await run_in_threadpool(_load_and_embed, query, field_weights is not None)
+        except FileNotFoundError as e:
+            raise HTTPException(status_code=500, detail=str(e))
+        except RuntimeError as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+        if field_weights is None:
+            results = await _rank(data, scoring, qvec)
+            payload = {"query": query, "recommended_internships": results}
+        else:
+            results = await _rank_by_fields(data, scoring, qvec, field_weights)
+            payload = {"query": query, "weights": field_weights, "recommended_internships": results}
+
+    cached = _response_cache.put(version, key, payload)
+    return cached.to_response(request, RECOMMEND_CACHE_CONTROL)
+
+@app.get("/internships/{internship_id}/similar")
+def similar_internships(internship_id: int, k: int = Query(5, ge=1, le=50)):
+    """
+    Internships most similar to the given one ("more like this"), read from the
+    precomputed kNN graph. internship_id is the `id` returned by /recommend.
     """
+    catalog_version()
     try:
-        model_obj = load_model()
-        vectors = load_vectors()
         data = load_data()
+        graph = load_knn_graph()
+        vectors = load_vectors()
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    if len(graph) != len(data):
+        raise HTTPException(status_code=500, detail="kNN graph is out of date with the catalog; rebuild it")
+    if not 0 <= internship_id < len(data):
+        raise HTTPException(status_code=404, detail=f"Internship {internship_id} not found")
+    if k > graph.k:
+        raise HTTPException(status_code=400, detail=f"k must be at most {graph.k} (neighbours stored in the kNN graph)")
+    # no known tokens: every "neighbour" would be an arbitrary row at similarity 0
+    if not np.any(vectors[internship_id]):
+        return {"id": internship_id, "similar_internships": []}
+
+    ids, scores = graph.neighbours(internship_id, k)
+    rows = data.iloc[ids][["Title", "Company", "Location"]].to_dict(orient="records")
+    similar = [
+        {"id": nid, **row, "similarity": score}
+        for nid, row, score in zip(ids.tolist(), rows, scores.tolist())
+    ]
+    return {"id": internship_id, "similar_internships": similar}
+
+@app.get("/skills/suggest")
+def suggest_skills(
+    prefix: str = Query(..., min_length=1, description="What the user has typed so far"),
+    limit: int = Query(10, ge=1, le=50),
+):
+    """
+    Type-ahead for the skills field: known skills starting with prefix,
+    most frequent in the catalog first.
+    Example: /skills/suggest?prefix=mach
+    """
+    catalog_version()
+    try:
+        suggester = load_skill_suggester()
     except FileNotFoundError as e:
         raise HTTPException(status_code=500, detail=str(e))
     except RuntimeError as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-    qvec = get_vector_from_text(model_obj, skill)
-    sims = cosine_sim_matrix(vectors, qvec)
+    suggestions = [{"skill": skill, "count": count} for skill, count in suggester.suggest(prefix, limit)]
+    return {"prefix": prefix, "suggestions": suggestions}
 
-    # attach and return top 5
-    data = data.copy()
-    data["similarity"] = sims
-    # ensure Title column exists
-    if "Title" not in data.columns:
-        raise HTTPException(status_code=500, detail="Data file missing 'Title' column")
+def _related_payload(neighbours) -> Optional[list]:
+    if neighbours is None:
+        return None
+    return [{"skill": skill, "similarity": score} for skill, score in neighbours]
 
-    top5 = (
-        data.sort_values("similarity", ascending=False)
-        .drop_duplicates(subset=["Title"])
-        .head(5)
-    )
+def _load_related_or_500() -> RelatedSkills:
+    catalog_version()
+    try:
+        return load_related_skills()
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/skills/related")
+def related_skills_batch(
+    skill: List[str] = Query(..., description="Repeat for each skill to expand"),
+    k: int = Query(10, ge=1, le=50),
+):
+    """
+    Related skills for a whole skill list in one round trip; unknown skills map to null.
+    Example: /skills/related?skill=python&skill=machine%20learning
+    """
+    related = _load_related_or_500().lookup(skill, k)
+    return {"related": {name: _related_payload(neighbours) for name, neighbours in related.items()}}
+
+@app.get("/skills/{skill}/related")
+def related_skills(skill: str, k: int = Query(10, ge=1, le=50)):
+    """
+    Skills the model places closest to the given one.
+    Example: /skills/python/related?k=5
+    """
+    neighbours = _load_related_or_500().lookup([skill], k)[skill]
+    if neighbours is None:
+        raise HTTPException(status_code=404, detail=f"Unknown skill: {skill}")
+    return {"skill": skill, "related": _related_payload(neighbours)}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Admission queue depth and in-flight work, in Prometheus text format."""
+    return render_metrics(recommend_admission)
 
-    results = top5[["Title", "Company", "Location", "similarity"]].to_dict(orient="records")
-    return {"query": skill, "recommended_internships": results}
+@app.on_event("shutdown")
+def close_shards():
+    if _shard_index is not None:
+        _shard_index.close()
 
 @app.get("/")
 def root():
@@ -0,0 +1,93 @@
+# src/batching.py
+"""
+Dynamic micro-batching for the scoring stage.
+
+Concurrent requests each submit a single query vector. A background task
+collects whatever arrives within a short window (or until the batch is full),
+scores the whole batch with one matrix-matrix product and resolves every
+caller's future with its own row of scores.
+"""
+import asyncio
+import logging
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """Collect query vectors and score them together.
+
+    score_fn receives a (batch, dim) matrix and must return a (batch, n) array;
+    it runs in the default executor so the event loop keeps accepting requests
+    while a batch is being scored. While one batch is scoring, new queries queue
+    up and are picked up by the next batch, so batch size grows with load.
+    """
+
+    def __init__(
+        self,
+        score_fn: Callable[[np.ndarray], np.ndarray],
+        window_ms: float = 2.0,
+        max_batch_size: int = 64,
+    ):
+        self.score_fn = score_fn
+        self.window = max(window_ms, 0.0) / 1000.0
+        self.max_batch_size = max(int(max_batch_size), 1)
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _ensure_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def submit(self, qvec: np.ndarray) -> np.ndarray:
+        """Queue one query vector and wait for its row of scores."""
+        self._ensure_worker()
+        fut = self._loop.create_future()
+        self._queue.put_nowait((np.asarray(qvec, dtype=float), fut))
+        return await fut
+
+    async def _collect(self) -> List[Tuple[np.ndarray, asyncio.Future]]:
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.window
+
+        while len(batch) < self.max_batch_size:
+            # take whatever is already waiting without paying for the window
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - self._loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect()
+            batch = [(q, fut) for q, fut in batch if not fut.done()]
+            if not batch:
+                continue
+
+            queries = np.vstack([q for q, _ in batch])
+            try:
+                scores = await self._loop.run_in_executor(None, self.score_fn, queries)
+            except Exception as e:
+                logger.exception("Batch scoring failed for %d queries", len(batch))
+                for _, fut in batch:
+                    if not fut.done():
+                        fut.set_exception(e)
+                continue
+
+            for row, (_, fut) in zip(scores, batch):
+                if not fut.done():
+                    fut.set_result(row)
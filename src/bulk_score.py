@@ -0,0 +1,140 @@
+# src/bulk_score.py
+"""
+Offline bulk scoring of stored user profiles, e.g. for weekly digests.
+
+Profiles are read from JSONL or CSV in fixed-size chunks and embedded with
+get_vector_from_text, exactly as /recommend embeds a query. Each chunk is
+scored against the whole catalog with blocked_top_k, so only a
+(chunk, candidates + block) tile is ever materialized. Title duplicates are
+dropped as in /recommend, and users left short by them are rescored with a
+wider candidate list, as /recommend widens its search. Every user's recommendations are appended to a
+JSONL file as soon as their chunk is done. Memory is bounded by the chunk and
+block sizes, however many users and internships there are.
+
+Run from the repository root:
+    python -m src.bulk_score profiles.jsonl --text-fields skills,field --out digests.jsonl
+"""
+import argparse
+from pathlib import Path
+from typing import Iterator, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.response_cache import encode_json
+from src.similarity import DEFAULT_BLOCK, blocked_top_k, normalize_rows
+
+
+def read_profiles(path: Path, chunksize: int) -> Iterator[pd.DataFrame]:
+    """Profile chunks from a .jsonl/.json (one object per line) or .csv file."""
+    if path.suffix in (".jsonl", ".json"):
+        reader = pd.read_json(path, lines=True, chunksize=chunksize, dtype=False)
+    else:
+        reader = pd.read_csv(path, chunksize=chunksize, dtype=str, keep_default_na=False)
+    with reader:
+        yield from reader
+
+
+def profile_texts(chunk: pd.DataFrame, text_fields: Sequence[str]) -> List[str]:
+    missing = [f for f in text_fields if f not in chunk.columns]
+    if missing:
+        raise ValueError(f"Profiles are missing fields: {missing}")
+    parts = chunk[list(text_fields)].fillna("").astype(str)
+    return parts.agg(" ".join, axis=1).tolist()
+
+
+def top_unique(idx: np.ndarray, val: np.ndarray, titles: np.ndarray, n: int):
+    """First n candidates with distinct titles, keeping score order."""
+    seen, picked = set(), []
+    for i, score in zip(idx.tolist(), val.tolist()):
+        if titles[i] in seen:
+            continue
+        seen.add(titles[i])
+        picked.append((i, score))
+        if len(picked) == n:
+            break
+    return picked
+
+
+def bulk_score(
+    profiles_path: Path,
+    out_path: Path,
+    id_field: str = "id",
+    text_fields: Sequence[str] = ("skills",),
+    n: int = 5,
+    candidates: int = 50,
+    chunksize: int = 2048,
+    block_size: int = DEFAULT_BLOCK,
+) -> int:
+    """Score every profile and write one JSON line of recommendations per user. Returns the user count."""
+    from src.api import get_vector_from_text, load_data, load_model, load_vectors
+
+    model_obj = load_model()
+    catalog = normalize_rows(load_vectors())
+    data = load_data()
+    if len(data) != len(catalog):
+        raise ValueError(f"Catalog has {len(data)} rows but {len(catalog)} vectors")
+    titles = data["Title"].to_numpy()
+    rows = data[["Title", "Company", "Location"]].to_dict(orient="records")
+    k = max(n, min(candidates, len(catalog)))
+
+    tmp_path = out_path.with_name(out_path.name + ".tmp")
+    count = 0
+    with open(tmp_path, "wb") as out:
+        for chunk in read_profiles(profiles_path, chunksize):
+            if id_field not in chunk.columns:
+                raise ValueError(f"Profiles are missing the id field {id_field!r}")
+            queries = normalize_rows(np.vstack([
+                get_vector_from_text(model_obj, text) for text in profile_texts(chunk, text_fields)
+            ]))
+            has_tokens = np.any(queries != 0, axis=1)
+            idx, val = blocked_top_k(queries, catalog, k, block_size)
+            # profiles with no known skills get no recommendations rather than arbitrary ones
+            picks = [
+                top_unique(user_idx, np.clip(user_val, -1.0, 1.0), titles, n) if ok else []
+                for ok, user_idx, user_val in zip(has_tokens, idx, val)
+            ]
+
+            # duplicate titles ate into the candidates; widen the search until n survive
+            wide = k
+            short = [j for j, picked in enumerate(picks) if has_tokens[j] and len(picked) < n]
+            while short and wide < len(catalog):
+                wide = min(4 * wide, len(catalog))
+                short_idx, short_val = blocked_top_k(queries[short], catalog, wide, block_size)
+                for j, user_idx, user_val in zip(short, short_idx, short_val):
+                    picks[j] = top_unique(user_idx, np.clip(user_val, -1.0, 1.0), titles, n)
+                short = [j for j in short if len(picks[j]) < n]
+
+            for user_id, picked in zip(chunk[id_field].tolist(), picks):
+                recommendations = [{"id": i, **rows[i], "similarity": score} for i, score in picked]
+                # strict JSON, as served by the API: empty catalog cells become null, not NaN
+                out.write(encode_json({"user_id": user_id, "recommended_internships": recommendations}) + b"\n")
+            out.flush()
+            count += len(chunk)
+
+    tmp_path.replace(out_path)
+    return count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Score stored user profiles against the internship catalog")
+    parser.add_argument("profiles", type=Path, help="Profiles as JSONL or CSV")
+    parser.add_argument("--out", type=Path, required=True, help="JSONL output, one line per user")
+    parser.add_argument("--id-field", default="id")
+    parser.add_argument("--text-fields", default="skills", help="Comma-separated profile fields to embed")
+    parser.add_argument("--top", type=int, default=5, help="Recommendations per user")
+    parser.add_argument("--candidates", type=int, default=50, help="Top rows fetched per user before title dedup")
+    parser.add_argument("--chunksize", type=int, default=2048)
+    parser.add_argument("--block-size", type=int, default=DEFAULT_BLOCK)
+    args = parser.parse_args()
+
+    text_fields = [f.strip() for f in args.text_fields.split(",") if f.strip()]
+    count = bulk_score(
+        args.profiles, args.out, args.id_field, text_fields,
+        args.top, args.candidates, args.chunksize, args.block_size,
+    )
+    print(f"✅ Recommendations for {count} users saved to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
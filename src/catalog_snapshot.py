@@ -0,0 +1,110 @@
+# src/catalog_snapshot.py
+"""
+Pre-serialized catalog listing.
+
+A CatalogSnapshot encodes a list of JSON rows exactly once: every "key":value
+pair becomes a byte fragment, every row a byte string, and the full listing
+body is compressed once with gzip (and brotli when installed). Full listings
+are served from those buffers by content negotiation; pages and field
+projections are spliced together from the row fragments without re-encoding.
+"""
+import gzip
+import json
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from fastapi import Request, Response
+
+from src.response_cache import etag_for, etag_matches
+
+# brotli is optional; without it clients simply get gzip
+try:
+    import brotli
+except Exception:
+    brotli = None
+
+# Preferred order when the client accepts several encodings equally
+ENCODING_PREFERENCE = ("br", "gzip", "identity")
+
+
+def parse_accept_encoding(header: Optional[str]) -> Dict[str, float]:
+    """Map of encoding -> q value from an Accept-Encoding header."""
+    accepted: Dict[str, float] = {}
+    for part in (header or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, params = part.partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    return accepted
+
+
+class CatalogSnapshot:
+    """Immutable, pre-encoded view of one catalog version."""
+
+    def __init__(self, rows: Sequence[Dict], version: str, items_key: str = "internships"):
+        self.version = version
+        self.items_key = items_key
+        self.count = len(rows)
+
+        self.fields: List[str] = []
+        for row in rows:
+            for key in row:
+                if key not in self.fields:
+                    self.fields.append(key)
+
+        self._fragments: List[Dict[str, bytes]] = [
+            {key: json.dumps(key).encode() + b":" + json.dumps(value).encode() for key, value in row.items()}
+            for row in rows
+        ]
+        self._rows: List[bytes] = [b"{" + b",".join(frag.values()) + b"}" for frag in self._fragments]
+
+        body = self._envelope(self._rows, {"count": self.count})
+        self.bodies: Dict[str, bytes] = {"identity": body, "gzip": gzip.compress(body, compresslevel=9)}
+        if brotli is not None:
+            self.bodies["br"] = brotli.compress(body)
+        self.etags = {encoding: etag_for(data) for encoding, data in self.bodies.items()}
+
+    def _envelope(self, rows: Iterable[bytes], meta: Dict) -> bytes:
+        head = b",".join(json.dumps(k).encode() + b":" + json.dumps(v).encode() for k, v in meta.items())
+        return b"{" + head + b"," + json.dumps(self.items_key).encode() + b":[" + b",".join(rows) + b"]}"
+
+    def choose_encoding(self, accept_encoding: Optional[str]) -> str:
+        accepted = parse_accept_encoding(accept_encoding)
+        wildcard = accepted.get("*")
+        best, best_q = "identity", 0.0
+        for encoding in ENCODING_PREFERENCE:
+            if encoding not in self.bodies:
+                continue
+            q = accepted.get(encoding, wildcard if wildcard is not None else 0.0)
+            if q > best_q:
+                best, best_q = encoding, q
+        return best
+
+    def full_response(self, request: Request, cache_control: str) -> Response:
+        """The whole listing from the pre-compressed buffer the client prefers."""
+        encoding = self.choose_encoding(request.headers.get("accept-encoding"))
+        headers = {"ETag": self.etags[encoding], "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+        if etag_matches(request, self.etags[encoding]):
+            return Response(status_code=304, headers=headers)
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(content=self.bodies[encoding], media_type="application/json", headers=headers)
+
+    def page(self, offset: int = 0, limit: Optional[int] = None, fields: Optional[Sequence[str]] = None) -> bytes:
+        """One page, optionally projected onto fields, built from pre-encoded fragments."""
+        stop = self.count if limit is None else min(offset + limit, self.count)
+        if fields is None:
+            rows = self._rows[offset:stop]
+        else:
+            rows = [
+                b"{" + b",".join(frag[f] for f in fields if f in frag) + b"}"
+                for frag in self._fragments[offset:stop]
+            ]
+        return self._envelope(rows, {"count": self.count, "offset": offset, "limit": limit})
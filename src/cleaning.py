@@ -0,0 +1,155 @@
+# src/cleaning.py
+"""
+Chunked, vectorized cleaning of scraped internship dumps.
+
+Reads any number of raw CSVs in fixed-size chunks, cleans every column with
+vectorized .str operations, drops duplicates across all inputs by hashing each
+cleaned row, and appends each chunk to a typed Parquet file. Memory stays
+bounded by the chunk size plus one 8-byte hash per unique row (kept in a
+sorted uint64 array), however large the inputs are. The serving API loads the Parquet catalog directly, so the
+catalog is then embedded row by row with the serving model into
+internship_vectors.pkl, keeping vectors and rows in step.
+
+Run from the repository root:
+    python -m src.cleaning src/data/internships_NEW.csv src/data/internships_scraped.csv \
+        --out src/data/internships.parquet
+"""
+import argparse
+import logging
+import pickle
+from pathlib import Path
+from typing import Iterable, Iterator, List
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.tokenizer import UNWANTED_CHARS
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ["Title", "Company", "Location", "Skills"]
+TEXT_COLUMNS = ["Title", "Company", "Location"]
+SCHEMA = pa.schema([
+    ("Title", pa.string()),
+    ("Company", pa.string()),
+    ("Location", pa.string()),
+    ("Skills", pa.string()),
+])
+
+
+def clean_chunk(df: pd.DataFrame) -> pd.DataFrame:
+    """Clean one chunk of raw rows. Every step is a vectorized column operation."""
+    missing = [c for c in COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"Input is missing columns: {missing}")
+    df = df[COLUMNS].fillna("").astype(str)
+
+    for col in TEXT_COLUMNS:
+        df[col] = df[col].str.replace(r"\s+", " ", regex=True).str.strip()
+
+    # Skills are what gets embedded: lowercase, drop the "+4 more" overflow marker,
+    # keep only the characters the shared tokenizer keeps, and normalize comma spacing
+    df["Skills"] = (
+        df["Skills"]
+        .str.replace(r"\+\d+(\s*more)?\s*$", "", regex=True)
+        .str.lower()
+        .str.replace(UNWANTED_CHARS, "", regex=True)
+        .str.replace(r"\s+", " ", regex=True)
+        .str.replace(r"\s*,\s*", ", ", regex=True)
+        .str.replace(r"(^[,\s]+|[,\s]+$)", "", regex=True)
+    )
+
+    return df[(df["Title"] != "") & (df["Skills"] != "")]
+
+
+def row_hashes(df: pd.DataFrame) -> np.ndarray:
+    """64-bit hash per row, case-insensitive so near-identical scrapes collapse."""
+    keys = pd.DataFrame({c: df[c].str.lower() for c in COLUMNS})
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy()
+
+
+def in_sorted(values: np.ndarray, sorted_values: np.ndarray) -> np.ndarray:
+    """Membership of each value in a sorted array, by binary search."""
+    pos = np.searchsorted(sorted_values, values)
+    found = pos < len(sorted_values)
+    found[found] = sorted_values[pos[found]] == values[found]
+    return found
+
+
+def iter_chunks(paths: Iterable[Path], chunksize: int) -> Iterator[pd.DataFrame]:
+    for path in paths:
+        logger.info("Reading %s", path)
+        for chunk in pd.read_csv(path, chunksize=chunksize, dtype=str, keep_default_na=False):
+            yield chunk
+
+
+def clean_files(paths: List[Path], out_path: Path, chunksize: int = 50_000) -> int:
+    """Clean and deduplicate paths into a single Parquet file. Returns rows written."""
+    seen = np.empty(0, dtype=np.uint64)
+    written = 0
+    tmp_path = out_path.with_suffix(out_path.suffix + ".tmp")
+
+    with pq.ParquetWriter(tmp_path, SCHEMA, compression="zstd") as writer:
+        for raw in iter_chunks(paths, chunksize):
+            df = clean_chunk(raw)
+            hashes = row_hashes(df)
+            keep = ~pd.Series(hashes).duplicated().to_numpy()
+            keep &= ~in_sorted(hashes, seen)
+            if not keep.any():
+                continue
+
+            seen = np.union1d(seen, hashes[keep])
+            df = df[keep]
+            writer.write_table(pa.Table.from_pandas(df, schema=SCHEMA, preserve_index=False))
+            written += len(df)
+
+    # only replace the serving catalog once the whole file is complete
+    tmp_path.replace(out_path)
+    logger.info("Wrote %d unique rows to %s", written, out_path)
+    return written
+
+
+def embed_catalog(catalog_path: Path, vectors_path: Path) -> int:
+    """Embed each catalog row's Skills with the serving model, in row order. Returns rows embedded."""
+    from src.api import get_vector_from_text, load_model
+
+    model_obj = load_model()
+    skills = pd.read_parquet(catalog_path, columns=["Skills"])["Skills"].fillna("").tolist()
+    vectors = np.zeros((len(skills), model_obj.vector_size), dtype=float)
+    for i, text in enumerate(skills):
+        vectors[i] = get_vector_from_text(model_obj, text)
+
+    tmp_path = vectors_path.with_name(vectors_path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        pickle.dump(vectors, f)
+    tmp_path.replace(vectors_path)
+    return len(vectors)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Clean raw internship CSVs into a Parquet catalog")
+    parser.add_argument("inputs", nargs="+", type=Path, help="Raw CSV dumps with Title/Company/Location/Skills")
+    parser.add_argument("--out", type=Path, default=Path(__file__).resolve().parent / "data" / "internships.parquet")
+    parser.add_argument("--chunksize", type=int, default=50_000)
+    parser.add_argument("--vectors", type=Path, default=None,
+                        help="Where to write the catalog vectors (default: the serving internship_vectors.pkl)")
+    parser.add_argument("--skip-vectors", action="store_true",
+                        help="Only write the Parquet; /recommend needs vectors that match it row for row")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    count = clean_files(args.inputs, args.out, args.chunksize)
+    print(f"✅ Cleaned catalog saved to {args.out} ({count} rows)")
+
+    if not args.skip_vectors:
+        from src.api import VECTORS_PATH
+
+        vectors_path = args.vectors or VECTORS_PATH
+        embedded = embed_catalog(args.out, vectors_path)
+        print(f"✅ Catalog vectors saved to {vectors_path} ({embedded} rows)")
+
+
+if __name__ == "__main__":
+    main()
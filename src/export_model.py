@@ -0,0 +1,132 @@
+# src/export_model.py
+"""
+Export a slim, read-only serving model.
+
+The trained internship_word2vec.model carries the full Word2Vec training state
+(syn1neg, vocabulary counts tables, cumulative tables, ...). Serving only needs
+token vectors, so this writes a plain KeyedVectors file with the training state
+dropped, optionally pruned to the most frequent tokens, and with its vector
+array stored as a separate .npy so every worker can memory-map the same pages.
+Tokens that occur in the catalog are always kept, so catalog embeddings do not
+change. A size/memory report is printed (and optionally written as JSON).
+
+Run from the repository root:
+    python -m src.export_model --coverage 0.95 --report models_report.json
+"""
+import argparse
+import json
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from gensim.models import KeyedVectors, Word2Vec
+
+from src.tokenizer import tokenizer_for
+
+
+def load_keyed_vectors(path: Path) -> KeyedVectors:
+    """KeyedVectors from either a saved Word2Vec model or a KeyedVectors file."""
+    try:
+        obj = Word2Vec.load(str(path))
+    except Exception:
+        obj = KeyedVectors.load(str(path))
+    return obj.wv if hasattr(obj, "wv") else obj
+
+
+def files_size(path: Path) -> int:
+    """Bytes on disk for a gensim save, including its separately stored arrays."""
+    return sum(p.stat().st_size for p in path.parent.glob(path.name + "*"))
+
+
+def catalog_token_counts(wv: KeyedVectors, texts: Iterable[str]) -> Counter:
+    tokenizer = tokenizer_for(wv)
+    counts = Counter()
+    for text in texts:
+        counts.update(tokenizer.tokenize(text))
+    return counts
+
+
+def select_keys(
+    wv: KeyedVectors,
+    catalog_counts: Counter,
+    min_count: Optional[int] = None,
+    coverage: Optional[float] = None,
+) -> List[str]:
+    """Keys to keep, in the original frequency order."""
+    keys = list(wv.index_to_key)
+    counts = np.array([wv.get_vecattr(k, "count") for k in keys], dtype=np.int64)
+    keep = np.ones(len(keys), dtype=bool)
+
+    if min_count is not None:
+        keep &= counts >= min_count
+    if coverage is not None and counts.sum() > 0:
+        # smallest frequency-ordered prefix whose training counts reach the coverage target
+        order = np.argsort(-counts, kind="stable")
+        cumulative = np.cumsum(counts[order]) / counts.sum()
+        cutoff = int(np.searchsorted(cumulative, coverage)) + 1
+        in_prefix = np.zeros(len(keys), dtype=bool)
+        in_prefix[order[:cutoff]] = True
+        keep &= in_prefix
+
+    return [k for k, kept in zip(keys, keep) if kept or k in catalog_counts]
+
+
+def export(wv: KeyedVectors, keys: List[str], out_path: Path) -> KeyedVectors:
+    slim = KeyedVectors(vector_size=wv.vector_size, dtype=np.float32)
+    slim.add_vectors(keys, wv[keys].astype(np.float32))
+    for key in keys:
+        slim.set_vecattr(key, "count", int(wv.get_vecattr(key, "count")))
+    # sep_limit=0 stores the vectors as their own .npy, so loading with mmap="r" shares them
+    slim.save(str(out_path), sep_limit=0)
+    return slim
+
+
+def report(model_path: Path, out_path: Path, wv: KeyedVectors, slim: KeyedVectors, catalog_counts: Counter) -> Dict:
+    total = sum(catalog_counts.values())
+    kept = sum(n for k, n in catalog_counts.items() if k in slim.key_to_index)
+    counts_before = sum(wv.get_vecattr(k, "count") for k in wv.index_to_key)
+    counts_after = sum(slim.get_vecattr(k, "count") for k in slim.index_to_key)
+    return {
+        "source": str(model_path),
+        "exported": str(out_path),
+        "file_bytes_before": files_size(model_path),
+        "file_bytes_after": files_size(out_path),
+        "vocab_before": len(wv.index_to_key),
+        "vocab_after": len(slim.index_to_key),
+        "vector_bytes_before": int(wv.vectors.nbytes),
+        "vector_bytes_after": int(slim.vectors.nbytes),
+        "training_token_coverage": round(counts_after / counts_before, 4) if counts_before else 1.0,
+        "catalog_token_coverage": round(kept / total, 4) if total else 1.0,
+    }
+
+
+def main() -> None:
+    from src.api import MODEL_PATH, SERVING_MODEL_PATH, load_data
+
+    parser = argparse.ArgumentParser(description="Export a slim read-only KeyedVectors model for serving")
+    parser.add_argument("--model", type=Path, default=MODEL_PATH)
+    parser.add_argument("--out", type=Path, default=SERVING_MODEL_PATH)
+    parser.add_argument("--min-count", type=int, default=None, help="Drop tokens seen fewer times in training")
+    parser.add_argument("--coverage", type=float, default=None,
+                        help="Keep the most frequent tokens covering this fraction of training occurrences")
+    parser.add_argument("--report", type=Path, default=None, help="Also write the report as JSON")
+    args = parser.parse_args()
+
+    wv = load_keyed_vectors(args.model)
+    data = load_data()
+    texts = [t for col in ("Title", "Skills") if col in data.columns for t in data[col].fillna("").astype(str)]
+    catalog_counts = catalog_token_counts(wv, texts)
+
+    keys = select_keys(wv, catalog_counts, args.min_count, args.coverage)
+    slim = export(wv, keys, args.out)
+
+    summary = report(args.model, args.out, wv, slim, catalog_counts)
+    for name, value in summary.items():
+        print(f"{name:26} {value}")
+    if args.report:
+        args.report.write_text(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# src/field_embeddings.py
+"""
+Per-field internship embeddings in one contiguous matrix.
+
+Each internship gets one unit-normalized vector per field (title, skills, ...),
+stored side by side in a single (n, fields * dim) float32 matrix. A query is
+normalized once and tiled into the same layout with each block scaled by its
+field weight (weights are rescaled to sum to 1), so
+
+    matrix @ stacked_query == sum over fields of weight * cos(field vector, query)
+
+Re-weighting needs no re-embedding, and a weighted ranking is still a single
+matrix product over the catalog.
+
+Run from the repository root after the catalog or the model changes:
+    python -m src.field_embeddings
+"""
+import argparse
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.similarity import normalize_rows
+
+# Catalog column behind each field; fields whose column is missing are left out
+FIELD_COLUMNS = {"title": "Title", "skills": "Skills", "description": "Description", "location": "Location"}
+
+
+def parse_weights(spec: str) -> Dict[str, float]:
+    """'skills:2,title:1' -> {'skills': 2.0, 'title': 1.0}"""
+    weights = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        name, sep, value = part.partition(":")
+        if not sep:
+            raise ValueError(f"Expected field:weight, got {part.strip()!r}")
+        try:
+            weights[name.strip().lower()] = float(value)
+        except ValueError:
+            raise ValueError(f"Weight for {name.strip()!r} is not a number")
+    if not weights:
+        raise ValueError("No field weights given")
+    return weights
+
+
+@dataclass
+class FieldMatrix:
+    fields: Tuple[str, ...]
+    matrix: np.ndarray  # (n, len(fields) * dim) float32, each field block row-normalized
+
+    @property
+    def dim(self) -> int:
+        return self.matrix.shape[1] // max(len(self.fields), 1)
+
+    def __len__(self) -> int:
+        return len(self.matrix)
+
+    def weight_vector(self, weights: Mapping[str, float]) -> np.ndarray:
+        """Per-field weights in matrix order, rescaled to sum to 1."""
+        unknown = [name for name in weights if name not in self.fields]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)} (available: {', '.join(self.fields)})")
+        w = np.array([weights.get(name, 0.0) for name in self.fields], dtype=np.float32)
+        if (w < 0).any() or not np.isfinite(w).all() or w.sum() == 0:
+            raise ValueError("Field weights must be non-negative and not all zero")
+        return w / w.sum()
+
+    def stack_queries(self, queries: np.ndarray, weights: Mapping[str, float]) -> np.ndarray:
+        """(batch, dim) query vectors -> (batch, fields * dim) weighted stacked queries."""
+        normed = normalize_rows(np.atleast_2d(queries))
+        w = self.weight_vector(weights)
+        return (normed[:, None, :] * w[None, :, None]).reshape(len(normed), -1)
+
+    def score(self, stacked: np.ndarray) -> np.ndarray:
+        """Weighted cosine similarity of every row for each stacked query, (batch, n)."""
+        return np.clip(np.atleast_2d(stacked) @ self.matrix.T, -1.0, 1.0)
+
+    def save(self, path: Path) -> None:
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp.npz")
+        np.savez(tmp, fields=np.array(self.fields), matrix=self.matrix)
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "FieldMatrix":
+        with np.load(path) as f:
+            return cls(fields=tuple(f["fields"].tolist()), matrix=np.ascontiguousarray(f["matrix"]))
+
+
+def build_field_matrix(
+    texts: Mapping[str, Sequence[str]],
+    embed: Callable[[str], np.ndarray],
+    dim: int,
+) -> FieldMatrix:
+    """Embed every field's texts with embed() and lay the normalized blocks out side by side."""
+    fields = tuple(texts)
+    n = len(next(iter(texts.values()))) if fields else 0
+    matrix = np.zeros((n, len(fields) * dim), dtype=np.float32)
+    for i, name in enumerate(fields):
+        if n:
+            block = np.vstack([embed(text) for text in texts[name]])
+            matrix[:, i * dim:(i + 1) * dim] = normalize_rows(block)
+    return FieldMatrix(fields=fields, matrix=matrix)
+
+
+def catalog_field_texts(data: pd.DataFrame) -> Dict[str, List[str]]:
+    return {
+        name: data[column].fillna("").astype(str).tolist()
+        for name, column in FIELD_COLUMNS.items()
+        if column in data.columns
+    }
+
+
+def main() -> None:
+    from src.api import FIELDS_PATH, get_vector_from_text, load_data, load_model
+
+    parser = argparse.ArgumentParser(description="Build per-field internship embeddings")
+    parser.add_argument("--out", type=Path, default=FIELDS_PATH)
+    args = parser.parse_args()
+
+    model_obj = load_model()
+    fields = build_field_matrix(
+        catalog_field_texts(load_data()),
+        lambda text: get_vector_from_text(model_obj, text),
+        model_obj.vector_size,
+    )
+    fields.save(args.out)
+    print(f"✅ {', '.join(fields.fields)} embeddings for {len(fields)} internships saved to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,8 @@ from gensim.models import Word2Vec
 from sklearn.cluster import KMeans
 from sklearn.metrics.pairwise import cosine_similarity
 
+from src.tokenizer import tokenizer_for
+
 # ------------------------------
 # 1. Load trained Word2Vec model (trained on resumes)
 # ------------------------------
@@ -21,8 +23,8 @@ print("Internship dataset loaded with", len(data), "internships.")
 # 3. Convert internship skills to vectors
 # ------------------------------
 def get_vector(text):
-    words = text.lower().replace(',', ' ').split()
-    vecs = [model.wv[w] for w in words if w in model.wv]
+    tokens = tokenizer_for(model.wv).tokenize(text)  # same phrase tokens as training and the API
+    vecs = [model.wv[t] for t in tokens]
     return np.mean(vecs, axis=0) if vecs else np.zeros(model.vector_size)
 
 internship_vectors = np.array([get_vector(text) for text in data['Skills']])
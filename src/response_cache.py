@@ -0,0 +1,123 @@
+# src/response_cache.py
+"""
+Versioned TTL cache for serialized JSON responses.
+
+Entries are keyed by a canonical request key and tagged with the catalog/model
+version they were built from. Asking for a different version drops every entry,
+so a new catalog snapshot invalidates the whole cache at once. Cached bodies
+carry a strong ETag so clients and CDNs can revalidate with If-None-Match.
+"""
+import hashlib
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional
+
+from fastapi import Request, Response
+
+
+def etag_for(body: bytes) -> str:
+    """Strong ETag derived from the exact response bytes."""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True when the request's If-None-Match header covers etag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def _finite(value: Any) -> Any:
+    """Non-finite floats (missing catalog cells read as NaN) become null."""
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, dict):
+        return {k: _finite(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(v) for v in value]
+    return value
+
+
+def encode_json(payload: Any) -> bytes:
+    """Strict JSON: a literal NaN would be cached and served as an unparseable body."""
+    return json.dumps(_finite(payload), allow_nan=False).encode("utf-8")
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str
+    expires: float
+    media_type: str = "application/json"
+
+    def to_response(self, request: Request, cache_control: str, headers: Optional[dict] = None) -> Response:
+        """Full response, or a bodiless 304 when the client already has this ETag."""
+        out_headers = {"ETag": self.etag, "Cache-Control": cache_control}
+        if headers:
+            out_headers.update(headers)
+        if etag_matches(request, self.etag):
+            return Response(status_code=304, headers=out_headers)
+        return Response(content=self.body, media_type=self.media_type, headers=out_headers)
+
+
+class ResponseCache:
+    """Thread-safe LRU of CachedResponse entries bound to a single version."""
+
+    def __init__(self, ttl_seconds: float = 300.0, max_entries: int = 1024):
+        self.ttl = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def _check_version(self, version: str) -> None:
+        if version != self._version:
+            self._entries.clear()
+            self._version = version
+
+    def get(self, version: str, key: Hashable) -> Optional[CachedResponse]:
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, version: str, key: Hashable, payload: Any) -> CachedResponse:
+        """Serialize payload once and store it under (version, key)."""
+        body = payload if isinstance(payload, bytes) else encode_json(payload)
+        entry = CachedResponse(body=body, etag=etag_for(body), expires=time.monotonic() + self.ttl)
+        with self._lock:
+            self._check_version(version)
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def get_or_build(self, version: str, key: Hashable, build: Callable[[], Any]) -> CachedResponse:
+        entry = self.get(version, key)
+        if entry is None:
+            entry = self.put(version, key, build())
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,305 @@
+# src/scraper.py
+"""
+Internshala listing scraper.
+
+Fetches listing pages concurrently over a pooled requests.Session with a
+per-host concurrency cap and token-bucket rate limit, retries transient
+failures with exponential backoff, and streams parsed rows to the output CSV
+as each page completes instead of holding them in memory until the end.
+
+Each run writes a fresh CSV unless --append is given. Only appending runs
+revalidate pages with ETag / If-Modified-Since: an unchanged page costs a 304
+and adds no rows, which is only correct when its rows are already in the file.
+
+Run from the repository root:
+    python -m src.scraper --category backend-development --pages 8 --out src/data/internships_scraped.csv
+
+To exercise it offline, serve the fixture listing pages under src/data/fixtures
+with http.server and point --base-url at it:
+    python -m http.server 8765 --bind 127.0.0.1 --directory src/data/fixtures
+    python -m src.scraper --category machine-learning --pages 2 \
+        --base-url http://127.0.0.1:8765 --out /tmp/internships_fixture.csv \
+        --validators /tmp/validators.json
+That writes 5 rows. http.server answers If-Modified-Since, so repeating the
+command with --append gets a 304 for both pages and adds no rows.
+"""
+import argparse
+import csv
+import json
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+BASE_URL = "https://internshala.com"
+USER_AGENT = "Mozilla/5.0"
+COLUMNS = ["Title", "Company", "Location", "Skills"]
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Blocking token bucket: `rate` tokens per second, bursts of up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class HostLimiter:
+    """Per-host concurrency semaphore plus token bucket."""
+
+    def __init__(self, concurrency: int, rate: float):
+        self.concurrency = concurrency
+        self.rate = rate
+        self._hosts: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def for_host(self, host: str) -> tuple:
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = (threading.BoundedSemaphore(self.concurrency), TokenBucket(self.rate))
+            return self._hosts[host]
+
+
+class ValidatorCache:
+    """ETag / Last-Modified validators per URL, persisted as JSON between runs."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path
+        self._validators: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+        if path is not None and path.exists():
+            self._validators = json.loads(path.read_text())
+
+    def headers_for(self, url: str) -> Dict[str, str]:
+        with self._lock:
+            entry = self._validators.get(url, {})
+        headers = {}
+        if "etag" in entry:
+            headers["If-None-Match"] = entry["etag"]
+        if "last_modified" in entry:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def update(self, url: str, response: requests.Response) -> None:
+        entry = {}
+        if response.headers.get("ETag"):
+            entry["etag"] = response.headers["ETag"]
+        if response.headers.get("Last-Modified"):
+            entry["last_modified"] = response.headers["Last-Modified"]
+        if entry:
+            with self._lock:
+                self._validators[url] = entry
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        with self._lock:
+            data = json.dumps(self._validators, indent=2)
+        self.path.write_text(data)
+
+
+class Fetcher:
+    """Pooled, rate-limited, retrying HTTP GET with conditional requests."""
+
+    def __init__(
+        self,
+        concurrency_per_host: int = 4,
+        rate_per_host: float = 2.0,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        timeout: float = 15.0,
+        validators: Optional[ValidatorCache] = None,
+    ):
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=max(concurrency_per_host, 1) * 2, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.limiter = HostLimiter(concurrency_per_host, rate_per_host)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.validators = validators or ValidatorCache()
+
+    def _sleep_before_retry(self, attempt: int, response: Optional[requests.Response]) -> None:
+        delay = self.backoff * (2 ** attempt) * (1 + random.random())
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, float(retry_after))
+        time.sleep(delay)
+
+    def get(self, url: str, conditional: bool = True) -> Optional[str]:
+        """Page body, or None when the server says it has not changed (304, conditional only)."""
+        semaphore, bucket = self.limiter.for_host(urlparse(url).netloc)
+        for attempt in range(self.max_retries + 1):
+            response = None
+            with semaphore:
+                bucket.acquire()
+                try:
+                    headers = self.validators.headers_for(url) if conditional else {}
+                    response = self.session.get(url, headers=headers, timeout=self.timeout)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    if attempt == self.max_retries:
+                        raise
+                    logger.warning("Fetch %s failed (%s), retrying", url, e)
+            if response is not None:
+                if response.status_code == 304:
+                    return None
+                if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                    response.raise_for_status()
+                    self.validators.update(url, response)
+                    return response.text
+                logger.warning("Fetch %s returned %d, retrying", url, response.status_code)
+            self._sleep_before_retry(attempt, response)
+        return None
+
+    def close(self) -> None:
+        self.session.close()
+
+
+def parse_listing(html: str) -> List[Dict[str, str]]:
+    """Extract Title/Company/Location/Skills rows from one listing page."""
+    soup = BeautifulSoup(html, "html.parser")
+    rows = []
+    for intern in soup.find_all("div", class_="individual_internship"):
+        title = intern.find("h3", class_="job-internship-name")
+        company = intern.find("p", class_="company-name")
+        location = intern.find("div", class_="row-1-item locations")
+        skills = [s.text.strip() for s in intern.find_all("span", class_="round_tabs")]
+        rows.append({
+            "Title": title.text.strip() if title else "",
+            "Company": company.text.strip() if company else "",
+            "Location": location.text.strip() if location else "",
+            "Skills": ", ".join(skills),
+        })
+    return rows
+
+
+class RowWriter:
+    """Write rows to a CSV as they arrive; with append, add to an existing file without a second header."""
+
+    def __init__(self, path: Path, append: bool = False):
+        self.path = path
+        new_file = not append or not path.exists() or path.stat().st_size == 0
+        self._fh = open(path, "a" if append else "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._fh, fieldnames=COLUMNS)
+        if new_file:
+            self._writer.writeheader()
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def write(self, rows: Iterable[Dict[str, str]]) -> None:
+        with self._lock:
+            for row in rows:
+                self._writer.writerow(row)
+                self.count += 1
+            self._fh.flush()
+
+    def close(self) -> None:
+        self._fh.close()
+
+
+def listing_urls(categories: Iterable[str], pages: int, base_url: str = BASE_URL) -> List[str]:
+    base_url = base_url.rstrip("/")
+    return [
+        f"{base_url}/internships/{category}-internship/page-{page}"
+        for category in categories
+        for page in range(1, pages + 1)
+    ]
+
+
+def scrape(
+    categories: Iterable[str],
+    pages: int,
+    out_path: Path,
+    base_url: str = BASE_URL,
+    workers: int = 4,
+    fetcher: Optional[Fetcher] = None,
+    append: bool = False,
+) -> int:
+    """
+    Scrape every listing page and stream the rows to out_path. Returns rows written.
+    out_path is overwritten unless append is set; only then are unchanged pages skipped.
+    """
+    fetcher = fetcher or Fetcher(concurrency_per_host=workers)
+    writer = RowWriter(Path(out_path), append)
+    urls = listing_urls(categories, pages, base_url)
+
+    def fetch_and_parse(url: str) -> List[Dict[str, str]]:
+        html = fetcher.get(url, conditional=append)
+        return parse_listing(html) if html is not None else []
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(fetch_and_parse, url): url for url in urls}
+            for future in as_completed(futures):
+                url = futures[future]
+                try:
+                    rows = future.result()
+                except Exception as e:
+                    logger.error("Giving up on %s: %s", url, e)
+                    continue
+                writer.write(rows)
+                logger.info("Scraped %s (%d rows)", url, len(rows))
+    finally:
+        writer.close()
+        fetcher.validators.save()
+        fetcher.close()
+    return writer.count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Scrape Internshala listing pages to CSV")
+    parser.add_argument("--category", action="append", required=True,
+                        help="Listing category slug, e.g. machine-learning (repeatable)")
+    parser.add_argument("--pages", type=int, default=8)
+    parser.add_argument("--out", type=Path, required=True)
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent requests per host")
+    parser.add_argument("--rate", type=float, default=2.0, help="Requests per second per host")
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--append", action="store_true",
+                        help="Add to an existing --out instead of overwriting it; pages unchanged since the last run are skipped")
+    parser.add_argument("--validators", type=Path, default=None,
+                        help="JSON file storing ETag/Last-Modified validators between runs (used with --append)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    fetcher = Fetcher(
+        concurrency_per_host=args.workers,
+        rate_per_host=args.rate,
+        max_retries=args.retries,
+        validators=ValidatorCache(args.validators),
+    )
+    count = scrape(args.category, args.pages, args.out, args.base_url, args.workers, fetcher, args.append)
+    print(f"✅ Scraping complete! {count} rows written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+# src/sharding.py
+"""
+Scatter-gather top-k search over a sharded internship matrix.
+
+The unit-normalized matrix is copied once into a shared-memory block and split
+into contiguous row ranges, one per worker process. A query batch is sent to
+every shard, each shard scans only its own rows and returns a local top-k, and
+the coordinator merges those into the global top-k. Scores are cosine
+similarities, matching cosine_sim_matrix (zero rows and zero queries score 0).
+
+Workers pin their BLAS to one thread, so N shards use N cores instead of
+contending for the same ones.
+"""
+import logging
+import multiprocessing as mp
+import os
+import threading
+from multiprocessing import shared_memory
+from typing import List, Tuple
+
+import numpy as np
+
+from src.similarity import _merge_top_k, blocked_top_k, normalize_rows
+
+logger = logging.getLogger(__name__)
+
+# Read by BLAS libraries when numpy is first imported in the spawned worker
+_SINGLE_THREAD_ENV = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS")
+
+
+class ShardsClosed(RuntimeError):
+    """search() on an index that close() has already retired."""
+
+
+def _shard_worker(conn, shm_name: str, shape: Tuple[int, int], start: int, stop: int) -> None:
+    shm = shared_memory.SharedMemory(name=shm_name)
+    rows = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)[start:stop]
+    try:
+        while True:
+            msg = conn.recv()
+            if msg is None:
+                break
+            queries, k = msg
+            try:
+                idx, val = blocked_top_k(queries, rows, min(k, len(rows)))
+                conn.send((idx + start, val))
+            except Exception as e:
+                conn.send(e)
+    finally:
+        del rows
+        shm.close()
+        conn.close()
+
+
+class ShardedIndex:
+    """
+    Owns the shared matrix and one worker process per shard.
+    search() is thread-safe; close() waits for a search in progress, then stops
+    the workers and frees the block. Later searches raise ShardsClosed.
+    """
+
+    def __init__(self, vectors: np.ndarray, n_shards: int):
+        normed = normalize_rows(vectors)
+        self.shape = normed.shape
+        self.n_shards = max(1, min(int(n_shards), len(normed)))
+
+        self._shm = shared_memory.SharedMemory(create=True, size=max(normed.nbytes, 1))
+        np.ndarray(self.shape, dtype=np.float32, buffer=self._shm.buf)[:] = normed
+
+        bounds = np.linspace(0, len(normed), self.n_shards + 1).astype(int)
+        ctx = mp.get_context("spawn")
+        self._conns = []
+        self._procs = []
+        saved = {name: os.environ.get(name) for name in _SINGLE_THREAD_ENV}
+        try:
+            os.environ.update({name: "1" for name in _SINGLE_THREAD_ENV})
+            for start, stop in zip(bounds[:-1], bounds[1:]):
+                parent, child = ctx.Pipe()
+                proc = ctx.Process(
+                    target=_shard_worker,
+                    args=(child, self._shm.name, self.shape, int(start), int(stop)),
+                    daemon=True,
+                )
+                proc.start()
+                child.close()
+                self._conns.append(parent)
+                self._procs.append(proc)
+        finally:
+            for name, value in saved.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+        self._lock = threading.Lock()
+        self._closed = False
+        logger.info("Started %d search shards over %d rows", self.n_shards, self.shape[0])
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def search(self, queries: np.ndarray, k: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """(row ids, cosine similarities) of the top-k rows for each query, best first."""
+        queries = normalize_rows(np.atleast_2d(queries))
+        k = max(1, min(int(k), len(self)))
+
+        with self._lock:
+            if self._closed:
+                raise ShardsClosed("Search shards have been closed")
+            for conn in self._conns:
+                conn.send((queries, k))
+            replies = [conn.recv() for conn in self._conns]
+
+        best_idx = np.empty((len(queries), 0), dtype=np.int64)
+        best_val = np.empty((len(queries), 0), dtype=np.float32)
+        for reply in replies:
+            if isinstance(reply, Exception):
+                raise RuntimeError(f"Search shard failed: {reply}")
+            best_idx, best_val = _merge_top_k(best_idx, best_val, *reply, k)
+
+        order = np.argsort(-best_val, axis=1, kind="stable")
+        idx = np.take_along_axis(best_idx, order, axis=1)
+        val = np.clip(np.take_along_axis(best_val, order, axis=1), -1.0, 1.0)
+        return list(zip(idx, val))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            conns, procs = self._conns, self._procs
+            self._conns, self._procs = [], []
+        for conn in conns:
+            try:
+                conn.send(None)
+                conn.close()
+            except (BrokenPipeError, OSError):
+                pass
+        for proc in procs:
+            proc.join(timeout=5)
+            if proc.is_alive():
+                proc.terminate()
+        self._shm.close()
+        self._shm.unlink()
@@ -0,0 +1,196 @@
+# src/similarity.py
+"""
+Blocked top-k similarity search and the offline "similar internships" graph.
+
+blocked_top_k tiles the product of a block of queries against the catalog so
+memory stays O(queries * (k + block_size)) however large the catalog is.
+build_knn_graph uses it to compute every internship's k nearest neighbours and
+stores them as compact id/score arrays, so serving a "more like this" request
+is a slice lookup. update_knn_graph recomputes only what changed rows affect.
+
+Run from the repository root after the internship vectors change:
+    python -m src.similarity            # incremental when a graph already exists
+    python -m src.similarity --full
+"""
+import argparse
+import hashlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+DEFAULT_K = 20
+DEFAULT_BLOCK = 2048
+
+
+def normalize_rows(mat: np.ndarray) -> np.ndarray:
+    """float32 copy with unit-length rows; all-zero rows stay zero."""
+    mat = np.asarray(mat, dtype=np.float32)
+    norms = np.linalg.norm(mat, axis=1, keepdims=True)
+    return mat / np.where(norms == 0, 1.0, norms)
+
+
+def row_hashes(mat: np.ndarray) -> np.ndarray:
+    """64-bit content hash per row, used to find rows that changed between builds."""
+    mat = np.ascontiguousarray(mat, dtype=np.float32)
+    return np.array(
+        [int.from_bytes(hashlib.blake2b(row.tobytes(), digest_size=8).digest(), "little") for row in mat],
+        dtype=np.uint64,
+    )
+
+
+def _merge_top_k(best_idx, best_val, cand_idx, cand_val, k):
+    idx = np.concatenate([best_idx, cand_idx], axis=1)
+    val = np.concatenate([best_val, cand_val], axis=1)
+    if val.shape[1] <= k:
+        return idx, val
+    part = np.argpartition(-val, k - 1, axis=1)[:, :k]
+    return np.take_along_axis(idx, part, axis=1), np.take_along_axis(val, part, axis=1)
+
+
+def blocked_top_k(
+    queries: np.ndarray,
+    matrix: np.ndarray,
+    k: int,
+    block_size: int = DEFAULT_BLOCK,
+    self_index: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Top-k matrix rows by dot product for every query row, best first.
+    self_index[i] is the matrix row that query i came from; it is never returned.
+    """
+    nq, n = len(queries), len(matrix)
+    best_idx = np.empty((nq, 0), dtype=np.int64)
+    best_val = np.empty((nq, 0), dtype=np.float32)
+    rows = np.arange(nq)
+
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        tile = queries @ matrix[start:stop].T
+        if self_index is not None:
+            cols = self_index - start
+            mask = (cols >= 0) & (cols < stop - start)
+            tile[rows[mask], cols[mask]] = -np.inf
+        tile_idx = np.broadcast_to(np.arange(start, stop), tile.shape)
+        best_idx, best_val = _merge_top_k(best_idx, best_val, tile_idx, tile, k)
+
+    order = np.argsort(-best_val, axis=1, kind="stable")
+    return np.take_along_axis(best_idx, order, axis=1), np.take_along_axis(best_val, order, axis=1)
+
+
+@dataclass
+class KnnGraph:
+    ids: np.ndarray      # (n, k) int32 neighbour row ids, best first
+    scores: np.ndarray   # (n, k) float32 cosine similarities
+    hashes: np.ndarray   # (n,) uint64 content hash of each row's vector
+
+    @property
+    def k(self) -> int:
+        return self.ids.shape[1]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def neighbours(self, row: int, k: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        k = self.k if k is None else k
+        # float32 products can overshoot 1.0 by an ulp
+        return self.ids[row, :k], np.clip(self.scores[row, :k], -1.0, 1.0)
+
+    def save(self, path: Path) -> None:
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp.npz")
+        np.savez(tmp, ids=self.ids, scores=self.scores, hashes=self.hashes)
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "KnnGraph":
+        with np.load(path) as f:
+            return cls(ids=f["ids"], scores=f["scores"], hashes=f["hashes"])
+
+
+def _rows_top_k(normed, rows, k, block_size):
+    ids = np.empty((len(rows), k), dtype=np.int32)
+    scores = np.empty((len(rows), k), dtype=np.float32)
+    for start in range(0, len(rows), block_size):
+        block = rows[start:start + block_size]
+        idx, val = blocked_top_k(normed[block], normed, k, block_size, self_index=block)
+        ids[start:start + len(block)] = idx
+        scores[start:start + len(block)] = val
+    return ids, scores
+
+
+def build_knn_graph(vectors: np.ndarray, k: int = DEFAULT_K, block_size: int = DEFAULT_BLOCK) -> KnnGraph:
+    """All-pairs top-k cosine neighbour graph, excluding each row itself."""
+    normed = normalize_rows(vectors)
+    k = max(min(k, len(normed) - 1), 0)
+    ids, scores = _rows_top_k(normed, np.arange(len(normed)), k, block_size)
+    return KnnGraph(ids=ids, scores=scores, hashes=row_hashes(normed))
+
+
+def update_knn_graph(
+    graph: KnnGraph,
+    vectors: np.ndarray,
+    k: int = DEFAULT_K,
+    block_size: int = DEFAULT_BLOCK,
+) -> KnnGraph:
+    """
+    Bring graph up to date with vectors, recomputing only what changed rows affect.
+    Rows may be edited or appended; removals shift ids and force a full rebuild.
+    """
+    normed = normalize_rows(vectors)
+    n, n_old = len(normed), len(graph)
+    k = max(min(k, n - 1), 0)
+    if n < n_old or graph.k != k:
+        return build_knn_graph(vectors, k, block_size)
+
+    hashes = row_hashes(normed)
+    changed = np.concatenate([np.flatnonzero(hashes[:n_old] != graph.hashes), np.arange(n_old, n)])
+    if len(changed) == 0:
+        return graph
+
+    # Changed rows, and rows that currently list a changed row, need a full scan
+    stale = np.flatnonzero(np.isin(graph.ids, changed).any(axis=1))
+    recompute = np.union1d(changed, stale)
+
+    ids = np.empty((n, k), dtype=np.int32)
+    scores = np.empty((n, k), dtype=np.float32)
+    ids[:n_old], scores[:n_old] = graph.ids, graph.scores
+    ids[recompute], scores[recompute] = _rows_top_k(normed, recompute, k, block_size)
+
+    # Everyone else keeps their list and only checks the changed rows as new candidates
+    others = np.setdiff1d(np.arange(n), recompute)
+    changed_mat = normed[changed]
+    for start in range(0, len(others), block_size):
+        block = others[start:start + block_size]
+        cand_val = normed[block] @ changed_mat.T
+        cand_idx = np.broadcast_to(changed, cand_val.shape)
+        idx, val = _merge_top_k(ids[block], scores[block], cand_idx, cand_val, k)
+        order = np.argsort(-val, axis=1, kind="stable")
+        ids[block] = np.take_along_axis(idx, order, axis=1)
+        scores[block] = np.take_along_axis(val, order, axis=1)
+
+    return KnnGraph(ids=ids, scores=scores, hashes=hashes)
+
+
+def main() -> None:
+    from src.api import KNN_PATH, load_vectors
+
+    parser = argparse.ArgumentParser(description="Build the internship kNN graph")
+    parser.add_argument("--k", type=int, default=DEFAULT_K)
+    parser.add_argument("--block-size", type=int, default=DEFAULT_BLOCK)
+    parser.add_argument("--out", type=Path, default=KNN_PATH)
+    parser.add_argument("--full", action="store_true", help="Ignore any existing graph and rebuild everything")
+    args = parser.parse_args()
+
+    vectors = load_vectors()
+    if args.out.exists() and not args.full:
+        graph = update_knn_graph(KnnGraph.load(args.out), vectors, args.k, args.block_size)
+    else:
+        graph = build_knn_graph(vectors, args.k, args.block_size)
+    graph.save(args.out)
+    print(f"✅ kNN graph for {len(graph)} internships (k={graph.k}) saved to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# src/skill_index.py
+"""
+Skill type-ahead and related skills over the model vocabulary.
+
+SkillSuggester keeps every known skill in one sorted list, ranked by how often
+it appears in the catalog (then by model frequency). Suggestions for short
+prefixes, which match most of the list, are precomputed; longer prefixes are
+answered with a bisect into the sorted list and a partial sort of the small
+range that matches.
+
+RelatedSkills serves most_similar from a normalized copy of the vocabulary
+matrix, with the neighbours of the most frequent skills precomputed.
+"""
+import heapq
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.similarity import blocked_top_k, normalize_rows
+from src.tokenizer import normalize, split_phrases
+
+MAX_SUGGESTIONS = 50
+PRECOMPUTED_PREFIX_LEN = 2
+# Catalog phrases the model never learned are only suggested if they recur
+CATALOG_MIN_COUNT = 2
+# Longer entries are run-together skill lists from scraped rows, not skills
+MAX_SKILL_WORDS = 4
+
+MAX_RELATED = 50
+PRECOMPUTED_RELATED = 2000
+
+
+class SkillSuggester:
+    """Immutable prefix index; build one per catalog snapshot."""
+
+    def __init__(self, vocabulary: Iterable[str], catalog_skills: Iterable[str]):
+        counts = Counter()
+        for text in catalog_skills:
+            counts.update(split_phrases(text))
+
+        model_rank: Dict[str, int] = {}
+        for key in vocabulary:
+            key = normalize(key)
+            if key and key not in model_rank:
+                model_rank[key] = len(model_rank)
+        skills = set(model_rank) | {s for s, n in counts.items() if n >= CATALOG_MIN_COUNT}
+        skills = {s for s in skills if len(s.split()) <= MAX_SKILL_WORDS}
+
+        unranked = len(model_rank)
+        ranked = sorted(skills, key=lambda s: (-counts[s], model_rank.get(s, unranked), s))
+        self.counts = {s: counts[s] for s in ranked}
+        self._rank = {s: i for i, s in enumerate(ranked)}
+        self._sorted = sorted(ranked)
+
+        self._short: Dict[str, List[str]] = {}
+        for skill in ranked:
+            for length in range(1, min(PRECOMPUTED_PREFIX_LEN, len(skill)) + 1):
+                bucket = self._short.setdefault(skill[:length], [])
+                if len(bucket) < MAX_SUGGESTIONS:
+                    bucket.append(skill)
+
+    def __len__(self) -> int:
+        return len(self._sorted)
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Tuple[str, int]]:
+        """Up to limit (skill, catalog count) pairs starting with prefix, most frequent first."""
+        prefix = normalize(prefix)
+        limit = max(0, min(limit, MAX_SUGGESTIONS))
+        if not prefix or limit == 0:
+            return []
+
+        if len(prefix) <= PRECOMPUTED_PREFIX_LEN:
+            matches = self._short.get(prefix, [])[:limit]
+        else:
+            lo = bisect_left(self._sorted, prefix)
+            hi = bisect_left(self._sorted, prefix + "\uffff", lo)
+            matches = heapq.nsmallest(limit, self._sorted[lo:hi], key=self._rank.__getitem__)
+        return [(skill, self.counts[skill]) for skill in matches]
+
+
+class RelatedSkills:
+    """
+    most_similar over the model vocabulary, without renormalizing it per call.
+    Rows are normalized once; neighbours of the most frequent skills are precomputed,
+    and uncached lookups in one call share a single blocked matrix product.
+    """
+
+    def __init__(self, wv, precompute: int = PRECOMPUTED_RELATED, k: int = MAX_RELATED):
+        self.keys = list(wv.index_to_key)
+        self._index = {key: i for i, key in enumerate(self.keys)}
+        self._matrix = normalize_rows(wv.vectors)
+        self.k = max(0, min(k, len(self.keys) - 1))
+
+        # gensim orders the vocabulary by frequency, so the first rows are the common skills
+        top = np.arange(min(precompute, len(self.keys)))
+        self._cached_ids, self._cached_scores = self._neighbours(top)
+
+    def _neighbours(self, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        if len(rows) == 0 or self.k == 0:
+            return np.empty((len(rows), 0), dtype=np.int64), np.empty((len(rows), 0), dtype=np.float32)
+        return blocked_top_k(self._matrix[rows], self._matrix, self.k, self_index=rows)
+
+    def lookup(self, skills: Sequence[str], k: int = 10) -> Dict[str, Optional[List[Tuple[str, float]]]]:
+        """(skill, similarity) neighbours for each skill, best first; None for unknown skills."""
+        k = max(0, min(k, self.k))
+        rows = {skill: self._index.get(normalize(skill)) for skill in skills}
+        missing = sorted({row for row in rows.values() if row is not None and row >= len(self._cached_ids)})
+        computed = dict(zip(missing, zip(*self._neighbours(np.array(missing, dtype=np.int64)))))
+
+        result: Dict[str, Optional[List[Tuple[str, float]]]] = {}
+        for skill, row in rows.items():
+            if row is None:
+                result[skill] = None
+                continue
+            if row < len(self._cached_ids):
+                ids, scores = self._cached_ids[row], self._cached_scores[row]
+            else:
+                ids, scores = computed[row]
+            scores = np.clip(scores[:k], -1.0, 1.0)
+            result[skill] = [(self.keys[i], float(s)) for i, s in zip(ids[:k].tolist(), scores.tolist())]
+        return result
@@ -0,0 +1,162 @@
+# src/structured_logging.py
+"""
+Non-blocking, structured, sampled logging.
+
+setup_logging() routes the root logger through a bounded queue: callers only
+filter and enqueue a record, and a QueueListener thread formats and writes it.
+When the queue is full records are dropped instead of blocking. Records are
+key=value lines; log_event(logger, level, "event_name", key=value, ...) attaches
+the fields. Each level can be sampled (LOG_SAMPLE_<LEVEL>, fraction kept) and
+rate limited (LOG_RATE_<LEVEL>, records per second). Dropped records are counted
+and reported as dropped=N on the next line that gets through.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+
+
+def log_event(logger: logging.Logger, level: int, event: str, **fields) -> None:
+    """Log one structured event; the fields are only kept if the level is enabled."""
+    if logger.isEnabledFor(level):
+        logger.log(level, event, extra={"fields": fields})
+
+
+def _format_value(value) -> str:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    if not isinstance(value, str):
+        value = json.dumps(value, separators=(",", ":"), default=str)
+    if value == "" or any(c in value for c in ' ="\n\t'):
+        return json.dumps(value)
+    return value
+
+
+class KeyValueFormatter(logging.Formatter):
+    """One line per record: ts=... level=... logger=... event=... key=value ..."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        ts = datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds")
+        message = record.getMessage()
+        if record.exc_info:
+            message = f"{message}\n{self.formatException(record.exc_info)}"
+        pairs = [
+            ("ts", ts),
+            ("level", record.levelname.lower()),
+            ("logger", record.name),
+            ("event", message),
+        ]
+        pairs += list(getattr(record, "fields", {}).items())
+        if getattr(record, "dropped", 0):
+            pairs.append(("dropped", record.dropped))
+        return " ".join(f"{key}={_format_value(value)}" for key, value in pairs)
+
+
+class SamplingFilter(logging.Filter):
+    """Per-level sampling and token-bucket rate limiting, applied before enqueueing."""
+
+    def __init__(self, sample_rates: Dict[int, float], rate_limits: Dict[int, float]):
+        super().__init__()
+        self.sample_rates = sample_rates
+        self.rate_limits = rate_limits
+        self.dropped = 0
+        self._tokens = dict(rate_limits)
+        self._last = {level: time.monotonic() for level in rate_limits}
+        self._lock = threading.Lock()
+
+    def _take_token(self, level: int) -> bool:
+        rate = self.rate_limits.get(level)
+        if rate is None:
+            return True
+        now = time.monotonic()
+        self._tokens[level] = min(rate, self._tokens[level] + (now - self._last[level]) * rate)
+        self._last[level] = now
+        if self._tokens[level] < 1:
+            return False
+        self._tokens[level] -= 1
+        return True
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        rate = self.sample_rates.get(record.levelno, 1.0)
+        with self._lock:
+            if (rate < 1.0 and random.random() >= rate) or not self._take_token(record.levelno):
+                self.dropped += 1
+                return False
+            record.dropped, self.dropped = self.dropped, 0
+        return True
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops (and counts) records instead of blocking on a full queue."""
+
+    def __init__(self, log_queue: queue.Queue, sampler: SamplingFilter):
+        super().__init__(log_queue)
+        self.sampler = sampler
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self.sampler._lock:
+                self.sampler.dropped += 1 + getattr(record, "dropped", 0)
+
+
+def _level_settings(prefix: str, default: Optional[float]) -> Dict[int, float]:
+    settings = {}
+    for name in LEVELS:
+        value = os.getenv(f"{prefix}{name}")
+        if value is not None:
+            settings[logging.getLevelName(name)] = float(value)
+        elif default is not None:
+            settings[logging.getLevelName(name)] = default
+    return settings
+
+
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging(level: Optional[str] = None, max_queue: Optional[int] = None) -> QueueListener:
+    """Install the queue handler on the root logger and start its writer thread (idempotent)."""
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    level = level or os.getenv("LOG_LEVEL", "INFO")
+    max_queue = max_queue or int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+    log_queue: queue.Queue = queue.Queue(maxsize=max_queue)
+    sampler = SamplingFilter(_level_settings("LOG_SAMPLE_", None), _level_settings("LOG_RATE_", None))
+    handler = DroppingQueueHandler(log_queue, sampler)
+    handler.addFilter(sampler)
+
+    stream = logging.StreamHandler(sys.stderr)
+    stream.setFormatter(KeyValueFormatter())
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level.upper())
+
+    _listener = QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    return _listener
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,100 @@
+# src/tokenizer.py
+"""
+Shared text normalization and phrase tokenizer.
+
+Training treats each comma-separated skill ("machine learning") as one token.
+PhraseTokenizer is compiled once from a model vocabulary into a word trie and
+finds the longest vocabulary phrase at each position in a single left-to-right
+pass, so serving produces exactly the tokens the model was trained on and
+never looks up words that cannot be in the vocabulary.
+"""
+import re
+import threading
+import weakref
+from typing import Dict, Iterable, List
+
+# Characters kept by every stage; everything else is deleted, not spaced out,
+# so "node.js" -> "nodejs" both when training and when serving.
+UNWANTED_CHARS = r"[^a-z0-9,\s]"
+_UNWANTED_RE = re.compile(UNWANTED_CHARS)
+_SPACE_RE = re.compile(r"\s+")
+_PART_RE = re.compile(r"[a-z0-9]+|,")
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_END = ""  # trie key marking the end of a phrase; never a real word
+
+
+def normalize(text: str) -> str:
+    """Lowercase, drop unwanted characters and collapse whitespace."""
+    text = _UNWANTED_RE.sub("", str(text).lower())
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def split_phrases(text: str) -> List[str]:
+    """Comma-separated skill phrases, as used for training sentences."""
+    return [p.strip() for p in normalize(text).split(",") if p.strip()]
+
+
+def words(text: str) -> List[str]:
+    """Plain word tokens of the normalized text."""
+    return _WORD_RE.findall(normalize(text))
+
+
+class PhraseTokenizer:
+    """Longest-match phrase tokenizer over a fixed vocabulary."""
+
+    def __init__(self, vocabulary: Iterable[str]):
+        self._root: Dict = {}
+        self.size = 0
+        for key in vocabulary:
+            parts = words(key)
+            if not parts:
+                continue
+            node = self._root
+            for w in parts:
+                node = node.setdefault(w, {})
+            # first key wins; gensim orders index_to_key by frequency
+            if _END not in node:
+                node[_END] = key
+                self.size += 1
+
+    @classmethod
+    def from_keyed_vectors(cls, wv) -> "PhraseTokenizer":
+        return cls(wv.index_to_key)
+
+    def tokenize(self, text: str) -> List[str]:
+        """Vocabulary keys found in text. Commas end phrases; unknown words are skipped."""
+        parts = _PART_RE.findall(normalize(text))
+        n = len(parts)
+        tokens = []
+        i = 0
+        while i < n:
+            node = self._root.get(parts[i])
+            match, end = None, i + 1
+            j = i
+            while node is not None:
+                j += 1
+                if _END in node:
+                    match, end = node[_END], j
+                if j >= n:
+                    break
+                node = node.get(parts[j])
+            if match is not None:
+                tokens.append(match)
+            i = end
+        return tokens
+
+
+_compiled = weakref.WeakKeyDictionary()
+_compile_lock = threading.Lock()
+
+
+def tokenizer_for(wv) -> PhraseTokenizer:
+    """Tokenizer compiled from wv's vocabulary, built once per KeyedVectors object."""
+    tokenizer = _compiled.get(wv)
+    if tokenizer is None:
+        with _compile_lock:
+            tokenizer = _compiled.get(wv)
+            if tokenizer is None:
+                tokenizer = PhraseTokenizer.from_keyed_vectors(wv)
+                _compiled[wv] = tokenizer
+    return tokenizer